@@ -0,0 +1,202 @@
+from tilemap import TileMap
+from time import perf_counter
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+
+STAGES = ['central_pts_to_array', 'measure_distances', 'rgb_array', 'expand_image', 'img_with_grid', 'save']
+
+
+def time_stages(size, amount, scale, render, directory):
+    """
+    Function that measures time of every stage of construction,
+    visualization and saving of square Tile Map
+
+    :param size: Width and height of Tile Map
+    :type size: int
+    :param amount: Amount of central points
+    :type amount: int
+    :param scale: Length of side of a square made from every pixel
+    :type scale: int
+    :param render: If stages of rendering should be measured
+    :type render: bool
+    :param directory: Directory of saved images
+    :type directory: str
+    :returns: Dictionary of times of stages in seconds
+    :rtype: dict
+    """
+
+    tmap = TileMap(size, size, [], {}, amount, amount, seed=0)
+    times = dict()
+    start = perf_counter()
+    central_pts_array = tmap.central_pts_to_array(tmap.zeros_array, tmap.chosen_pts)
+    times['central_pts_to_array'] = perf_counter() - start
+    start = perf_counter()
+    tmap.labels = tmap.measure_distances(central_pts_array)
+    times['measure_distances'] = perf_counter() - start
+    start = perf_counter()
+    tmap.rgb_array
+    times['rgb_array'] = perf_counter() - start
+    if render:
+        start = perf_counter()
+        tmap.expand_image(scale)
+        times['expand_image'] = perf_counter() - start
+        start = perf_counter()
+        tmap.img_with_grid(scale)
+        times['img_with_grid'] = perf_counter() - start
+        start = perf_counter()
+        tmap.save(os.path.join(directory, 'benchmark.png'), scale)
+        times['save'] = perf_counter() - start
+    return times
+
+
+def run(sizes, amounts, scale, repeat, max_render_pixels):
+    """
+    Function that measures stages for every size of Tile Map and amount
+    of central points, keeping the shortest time of repeated measurements
+
+    :returns: List of results, one for every size, amount and stage
+    :rtype: list
+    """
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for amount in amounts:
+                if amount > size * size:
+                    continue
+                render = (size * scale) ** 2 <= max_render_pixels
+                best = dict()
+                for _ in range(repeat):
+                    for stage, seconds in time_stages(size, amount, scale, render, directory).items():
+                        best[stage] = min(seconds, best.get(stage, seconds))
+                for stage in STAGES:
+                    if stage in best:
+                        results.append({'size': size, 'central_pts': amount, 'stage': stage, 'seconds': best[stage]})
+                        print(f'{size:>5} {amount:>6} {stage:<21} {best[stage]:.6f} s', file=sys.stderr)
+    return results
+
+
+def parallel_speedup(size, amount, amounts, repeat, setting='workers'):
+    """
+    Function that measures finding the nearest central points of square
+    Tile Map with different amounts of threads or processes, keeping
+    the shortest time of repeated measurements
+
+    :param amounts: Amounts of threads or processes, the first one is reference
+    :type amounts: list
+    :param setting: 'workers' for threads or 'processes'
+    :type setting: str
+    :returns: List of results, one for every amount
+    :rtype: list
+    """
+
+    results = []
+    for amount_workers in amounts:
+        best = None
+        for _ in range(repeat):
+            tmap = TileMap(size, size, [], {}, amount, amount, seed=0, **{setting: amount_workers})
+            central_pts_array = tmap.central_pts_to_array(tmap.zeros_array, tmap.chosen_pts)
+            start = perf_counter()
+            tmap.measure_distances(central_pts_array)
+            seconds = perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        speedup = results[0]['seconds'] / best if results else 1.0
+        results.append({'size': size, 'central_pts': amount, setting: amount_workers, 'seconds': best, 'speedup': speedup})
+        print(f'{size:>5} {amount:>6} {amount_workers:>3} {setting:<9} {best:.6f} s, speedup {speedup:.2f}', file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Function that finds results slower than the same results
+    in baseline more than 'threshold' times
+
+    :returns: List of tuples with result and time from baseline
+    :rtype: list
+    """
+
+    previous = {(item['size'], item['central_pts'], item['stage']): item['seconds'] for item in baseline}
+    regressions = []
+    for item in results:
+        key = (item['size'], item['central_pts'], item['stage'])
+        if key in previous and item['seconds'] > previous[key] * threshold:
+            regressions.append((item, previous[key]))
+    return regressions
+
+
+def plot(results, path):
+    """
+    Function that plots time of every stage against amount of pixels,
+    one figure for every amount of central points
+    """
+
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print('matplotlib is not installed, plot was not made', file=sys.stderr)
+        return
+    amounts = sorted({item['central_pts'] for item in results})
+    figure, axes = plt.subplots(1, len(amounts), figsize=(5 * len(amounts), 4), squeeze=False)
+    for axis, amount in zip(axes[0], amounts):
+        for stage in STAGES:
+            points = [(item['size'] ** 2, item['seconds']) for item in results
+                      if item['central_pts'] == amount and item['stage'] == stage]
+            if points:
+                axis.loglog(*zip(*points), marker='o', label=stage)
+        axis.set_title(f'{amount} central points')
+        axis.set_xlabel('pixels')
+        axis.set_ylabel('seconds')
+        axis.legend(fontsize='small')
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of stages of Tile Map')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[32, 64, 128, 256, 512, 1024, 2048, 4096])
+    parser.add_argument('--central-pts', type=int, nargs='+', default=[16, 256, 4096])
+    parser.add_argument('--scale', type=int, default=16)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-render-pixels', type=int, default=2**26,
+                        help='rendering stages are skipped for bigger expanded images')
+    parser.add_argument('--output', default='benchmark.json', help='JSON file with results')
+    parser.add_argument('--plot', help='image file with scaling curves')
+    parser.add_argument('--threads', type=int, nargs='*', default=[],
+                        help='amounts of threads for which speedup of the biggest size and amount is measured, '
+                             'for example 1 2 4 8 16')
+    parser.add_argument('--processes', type=int, nargs='*', default=[],
+                        help='amounts of processes filling shared memory for which speedup is measured')
+    parser.add_argument('--baseline', help='JSON file with results to compare with')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='result slower than baseline this many times is a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.central_pts, args.scale, args.repeat, args.max_render_pixels)
+    output = {'scale': args.scale, 'results': results}
+    if args.threads:
+        output['threads'] = parallel_speedup(max(args.sizes), max(args.central_pts), args.threads, args.repeat)
+    if args.processes:
+        output['processes'] = parallel_speedup(
+            max(args.sizes), max(args.central_pts), args.processes, args.repeat, 'processes')
+    with open(args.output, 'w') as handle:
+        json.dump(output, handle, indent=1)
+    if args.plot:
+        plot(results, args.plot)
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle)['results'], args.threshold)
+        for item, seconds in regressions:
+            print(f"REGRESSION {item['size']} {item['central_pts']} {item['stage']}: "
+                  f"{item['seconds']:.6f} s, baseline {seconds:.6f} s")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
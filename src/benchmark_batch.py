@@ -0,0 +1,35 @@
+from tilemap_batch import generate_many
+from time import perf_counter
+import argparse
+
+
+def benchmark(amount, width, height, workers):
+    """
+    Function that measures how many Tile Maps per second are constructed
+    by generate_many with provided amount of workers
+
+    :returns: Amount of Tile Maps per second
+    :rtype: float
+    """
+
+    specs = [{'width': width, 'height': height, 'seed': seed} for seed in range(amount)]
+    start = perf_counter()
+    for _ in generate_many(specs, workers):
+        pass
+    return amount / (perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput of batch generation of Tile Maps')
+    parser.add_argument('--maps', type=int, default=400, help='amount of Tile Maps')
+    parser.add_argument('--width', type=int, default=64)
+    parser.add_argument('--height', type=int, default=64)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    for workers in args.workers:
+        speed = benchmark(args.maps, args.width, args.height, workers)
+        print(f'{workers} workers: {speed:.1f} maps/s')
+
+
+if __name__ == "__main__":
+    main()
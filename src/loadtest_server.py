@@ -0,0 +1,109 @@
+from tilemap import TileMap
+from tilemap_server import TileServer
+from time import perf_counter
+import argparse
+import asyncio
+import random
+import sys
+
+
+async def fetch_tiles(host, port, paths):
+    """
+    Coroutine that requests tiles one after another over one connection
+
+    :returns: Amount of received tiles
+    :rtype: int
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+    received = 0
+    try:
+        for path in paths:
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            received += status.split()[1] == b'200'
+    finally:
+        writer.close()
+    return received
+
+
+def tile_paths(max_zoom, requests, seed=0):
+    """
+    Function that draws paths of tiles, zoom is chosen uniformly,
+    so tiles of small zooms are requested many times
+
+    :returns: List of paths
+    :rtype: list
+    """
+
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(requests):
+        zoom = rng.randint(0, max_zoom)
+        paths.append(f'/{zoom}/{rng.randrange(2**zoom)}/{rng.randrange(2**zoom)}.png')
+    return paths
+
+
+async def load_test(host, port, paths, connections):
+    """
+    Coroutine that sends requests over many connections at once
+
+    :returns: Amount of received tiles and time in seconds
+    :rtype: tuple
+    """
+
+    start = perf_counter()
+    received = await asyncio.gather(*[fetch_tiles(host, port, paths[index::connections])
+                                      for index in range(connections)])
+    return sum(received), perf_counter() - start
+
+
+async def run(args):
+    if args.port is None:
+        tmap = TileMap(args.width, args.height, [], {}, args.central_pts, args.central_pts, seed=0)
+        server = TileServer(tmap, args.tile_size, args.cache_tiles)
+        started = await server.start(args.host, 0)
+        port = started.sockets[0].getsockname()[1]
+        max_zoom = server.max_zoom
+    else:
+        started, port, max_zoom = None, args.port, args.max_zoom
+    paths = tile_paths(max_zoom, args.requests)
+    try:
+        for attempt in ('cold', 'warm'):
+            received, seconds = await load_test(args.host, port, paths, args.connections)
+            print(f'{attempt}: {received} tiles in {seconds:.3f} s, {received / seconds:.1f} tiles/s')
+    finally:
+        if started is not None:
+            started.close()
+            await started.wait_closed()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test of server of tiles')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='port of running server, by default server is started here')
+    parser.add_argument('--max-zoom', type=int, default=4, help='highest zoom of running server')
+    parser.add_argument('--width', type=int, default=4096)
+    parser.add_argument('--height', type=int, default=4096)
+    parser.add_argument('--central-pts', type=int, default=1024)
+    parser.add_argument('--tile-size', type=int, default=256)
+    parser.add_argument('--cache-tiles', type=int, default=1024)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--connections', type=int, default=16)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 from tilemap import TileMap, load
+from tilemap_help_functions import palette_image, expand_array
+from ast import literal_eval
 from tilemap_exceptions import (
     InvalidData,
     verify_dimensions,
@@ -6,6 +8,10 @@ from tilemap_exceptions import (
 )
 
 
+# Length of side of blocks of points in the first preview of Tile Map
+PREVIEW_FACTOR = 8
+
+
 def create_map_from_input(mode):
     """
     Function that visualizes or loads Tile Map based on User's povided input
@@ -48,6 +54,22 @@ def create_map_from_input(mode):
             if_save(tmap)
 
 
+def report_progress(tmap, labels, size, show=False, scale=16):
+    """
+    Function that informs User which pass of making Tile Map is finished
+    and shows the first preview, made in 1/PREVIEW_FACTOR of resolution,
+    in the same size as visualized Tile Map, if User wants to see it
+    """
+
+    if size > 1:
+        print(f"Preview of tile map ready in 1/{size} of resolution ({labels.shape[1]}x{labels.shape[0]})")
+        if show and size == PREVIEW_FACTOR:
+            expanded = expand_array(labels, size * scale)[:tmap.height * scale, :tmap.width * scale]
+            palette_image(expanded, tmap.palette).show()
+    else:
+        print(f"Tile map ready")
+
+
 def create_map(width, height, grounds, own_grounds, min_pts, max_pts):
     """
     Function that creates Tile Map based on User's input
@@ -85,7 +107,10 @@ def get_own_grounds(input_w, input_h):
         omit_sign("'", input_rgb)
         if ('(' and ')') not in input_rgb:
             raise InvalidData(f"Wrong given RGB tuple")
-        input_own_grounds[input_name] = eval(input_rgb)
+        try:
+            input_own_grounds[input_name] = literal_eval(input_rgb)
+        except (ValueError, SyntaxError):
+            raise InvalidData(f"Wrong given RGB tuple")
         verify_grounds(input_w, input_h, own_grounds=input_own_grounds)
         if_next = input('Do you want to enter another custom ground?([y]/n) ')
         if if_next == ('n'.lower() or 'no'.lower()):
@@ -112,17 +137,22 @@ def get_grounds():
 
 def if_visualize(tmap):
     """
-    Function that asks User if he wants to visualize Tile Map
+    Function that asks User if he wants to visualize Tile Map, then makes
+    Tile Map in passes, showing its preview before the whole Map if he does
     """
 
     i = True
+    show = False
     while i:
         input_vis = input('Do you want to visualize your tile map?([y]/n) ')
         if input_vis == ('y'.lower() or 'yes'.lower()):
-            tmap.visualize()
+            show = True
             i = False
         if input_vis == ('n'.lower() or 'no'.lower()):
             i = False
+    tmap.progressive_labels(lambda labels, size: report_progress(tmap, labels, size, show), PREVIEW_FACTOR)
+    if show:
+        tmap.visualize()
 
 
 def if_save(tmap):
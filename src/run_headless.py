@@ -0,0 +1,177 @@
+from tilemap import TileMap
+from tilemap_batch import run_many
+from tilemap_exceptions import (
+    InvalidData,
+    verify_dimensions,
+    verify_grounds,
+    verify_pts,
+    verify_assignment,
+)
+from time import perf_counter
+import argparse
+import json
+import os
+import sys
+
+
+SPEC_KEYS = {'width', 'height', 'grounds', 'own_grounds', 'min_pts', 'max_pts', 'assignment', 'seed', 'output', 'scale'}
+
+
+def read_specs(stream):
+    """
+    Function that reads specifications of Tile Maps from JSON
+    (single object or list of objects) or JSONL text. Every line
+    of JSONL text that is not valid JSON is replaced by InvalidData,
+    so only its map fails
+
+    :param stream: Opened file or standard input
+    :returns: List of dictionaries
+    :rtype: list
+    """
+
+    text = stream.read()
+    try:
+        specs = json.loads(text)
+    except json.JSONDecodeError:
+        lines = [(number, line) for number, line in enumerate(text.splitlines(), 1) if line.strip()]
+        specs = []
+        for number, line in lines:
+            try:
+                specs.append(json.loads(line))
+            except json.JSONDecodeError as error:
+                specs.append(InvalidData(f"Line {number} is not valid JSON: {error}"))
+        if all(isinstance(spec, InvalidData) for spec in specs):
+            raise InvalidData(f"Specifications should be JSON or JSONL")
+    return specs if isinstance(specs, list) else [specs]
+
+
+def prepare_spec(spec, index, output_dir, scale):
+    """
+    Function that verifies specification of Tile Map
+    and completes it with default values
+
+    :returns: Dictionary of arguments of save_map function
+    :rtype: dict
+    """
+
+    if not isinstance(spec, dict):
+        raise InvalidData(f"Specification of map should be an object")
+    unknown = set(spec) - SPEC_KEYS
+    if unknown:
+        raise InvalidData(f"Unknown keys: {', '.join(sorted(unknown))}")
+    if 'width' not in spec or 'height' not in spec:
+        raise InvalidData(f"Wrong dimensions")
+    job = dict(spec)
+    job['grounds'] = job.get('grounds') or []
+    own_grounds = job.get('own_grounds') or {}
+    if type(own_grounds) != dict:
+        raise InvalidData(f"Grounds given by you should be dictionary")
+    job['own_grounds'] = {name: tuple(rgb) if isinstance(rgb, list) else rgb for name, rgb in own_grounds.items()}
+    width, height = job['width'], job['height']
+    verify_dimensions(width, height, job['grounds'], job['own_grounds'])
+    verify_grounds(width, height, job['grounds'], job['own_grounds'], job.get('min_pts'), job.get('max_pts'))
+    verify_pts(width, height, job['grounds'], job['own_grounds'], job.get('min_pts'), job.get('max_pts'))
+    verify_assignment(job.get('assignment'))
+    if job.get('seed') is not None and type(job['seed']) != int:
+        raise InvalidData(f"Seed should be an integer")
+    job['output'] = os.path.join(output_dir, job.get('output') or f'map_{index}.png')
+    if os.path.splitext(job['output'])[1].lower() not in {'.png', '.jpg', '.jpeg'}:
+        raise InvalidData(f"Unknown file extension")
+    job['scale'] = scale if job.get('scale') is None else job['scale']
+    if type(job['scale']) != int or job['scale'] < 1:
+        raise InvalidData(f"Scale should be a positive integer")
+    return job
+
+
+def save_map(job):
+    """
+    Function that constructs Tile Map and saves it to file
+
+    :param job: Dictionary of arguments of TileMap class
+    with keys 'output' and 'scale'
+    :type job: dict
+    :returns: Line of manifest
+    :rtype: dict
+    """
+
+    job = dict(job)
+    output, scale = job.pop('output'), job.pop('scale')
+    start = perf_counter()
+    tmap = TileMap(**job)
+    tmap.labels
+    generated = perf_counter()
+    tmap.save(output, scale)
+    saved = perf_counter()
+    return {
+        'output': output,
+        'central_pts': len(tmap.chosen_pts),
+        'generate_seconds': round(generated - start, 6),
+        'save_seconds': round(saved - generated, 6),
+    }
+
+
+def try_save_map(job):
+    """
+    Function that saves Tile Map like save_map function, but failure
+    of one map is described in its line of manifest instead of stopping
+    other maps
+
+    :returns: Line of manifest
+    :rtype: dict
+    """
+
+    try:
+        return dict({'status': 'ok'}, **save_map(job))
+    except Exception as error:
+        return {'status': 'error', 'output': job['output'], 'error': f'{type(error).__name__}: {error}'}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate Tile Maps without prompts')
+    parser.add_argument('specs', nargs='*', default=['-'],
+                        help="JSON or JSONL files with specifications of maps, '-' reads standard input")
+    parser.add_argument('--output-dir', default='.', help='directory of generated images')
+    parser.add_argument('--manifest', default='-', help="JSONL file with one line per map, '-' is standard output")
+    parser.add_argument('--workers', type=int, default=None, help='amount of processes')
+    parser.add_argument('--scale', type=int, default=16, help='size of pixel in saved images')
+    args = parser.parse_args(argv)
+
+    specs = []
+    for path in args.specs:
+        try:
+            if path == '-':
+                specs.extend(read_specs(sys.stdin))
+            else:
+                with open(path) as handle:
+                    specs.extend(read_specs(handle))
+        except (InvalidData, OSError, UnicodeDecodeError) as error:
+            print(f"Cannot read specifications from '{path}': {error}", file=sys.stderr)
+            return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest = sys.stdout if args.manifest == '-' else open(args.manifest, 'w')
+    jobs, indexes = [], []
+    failed = 0
+    try:
+        for index, spec in enumerate(specs):
+            try:
+                if isinstance(spec, InvalidData):
+                    raise spec
+                jobs.append(prepare_spec(spec, index, args.output_dir, args.scale))
+                indexes.append(index)
+            except (InvalidData, TypeError, ValueError) as error:
+                failed += 1
+                manifest.write(json.dumps({'index': index, 'status': 'error', 'error': str(error)}) + '\n')
+                manifest.flush()
+        for position, line in run_many(try_save_map, jobs, args.workers):
+            failed += line['status'] == 'error'
+            line = dict({'index': indexes[position]}, **line)
+            manifest.write(json.dumps(line) + '\n')
+            manifest.flush()
+    finally:
+        if manifest is not sys.stdout:
+            manifest.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
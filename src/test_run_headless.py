@@ -0,0 +1,65 @@
+import io
+import json
+import os
+import pytest
+from run_headless import main, read_specs
+from tilemap_exceptions import InvalidData
+
+
+def test_read_specs():
+    assert read_specs(io.StringIO('{"width": 10, "height": 10}')) == [{'width': 10, 'height': 10}]
+    assert len(read_specs(io.StringIO('{"width": 10, "height": 10}\n\n{"width": 12, "height": 10}\n'))) == 2
+    assert len(read_specs(io.StringIO('[{"width": 10, "height": 10}, {"width": 12, "height": 10}]'))) == 2
+    specs = read_specs(io.StringIO('{"width": 10, "height": 10}\n{"width": 1\n{"width": 12, "height": 10}\n'))
+    assert len(specs) == 3 and isinstance(specs[1], InvalidData)
+    with pytest.raises(InvalidData):
+        read_specs(io.StringIO('width: 10\nheight: 10\n'))
+
+
+def test_main(tmp_path):
+    specs = tmp_path / 'specs.jsonl'
+    specs.write_text('\n'.join([
+        json.dumps({'width': 12, 'height': 10, 'seed': 1, 'scale': 2}),
+        json.dumps({'width': 12, 'height': 10, 'own_grounds': {'red': [255, 0, 0]}, 'output': 'red.jpg'}),
+        json.dumps({'width': 12, 'height': 10, 'grounds': ['ocean']}),
+    ]))
+    manifest = tmp_path / 'manifest.jsonl'
+    code = main([str(specs), '--output-dir', str(tmp_path / 'out'), '--manifest', str(manifest), '--workers', '1'])
+    lines = sorted((json.loads(line) for line in manifest.read_text().splitlines()), key=lambda line: line['index'])
+    assert code == 1
+    assert [line['status'] for line in lines] == ['ok', 'ok', 'error']
+    assert sorted(os.listdir(str(tmp_path / 'out'))) == ['map_0.png', 'red.jpg']
+    assert lines[0]['generate_seconds'] >= 0 and lines[0]['save_seconds'] >= 0
+
+
+def test_main_keeps_going_after_failed_map(tmp_path):
+    specs = tmp_path / 'specs.jsonl'
+    specs.write_text('\n'.join([
+        json.dumps({'width': 12, 'height': 10, 'seed': 1}),
+        json.dumps({'width': 12, 'height': 10, 'seed': 'abc'}),
+        json.dumps({'width': 12, 'height': 10, 'scale': 0}),
+        json.dumps({'width': 12, 'height': 10, 'seed': 2, 'output': 'missing/map.png'}),
+        json.dumps({'width': 12, 'height': 10, 'seed': 3}),
+    ]))
+    manifest = tmp_path / 'manifest.jsonl'
+    code = main([str(specs), '--output-dir', str(tmp_path / 'out'), '--manifest', str(manifest), '--workers', '1'])
+    lines = sorted((json.loads(line) for line in manifest.read_text().splitlines()), key=lambda line: line['index'])
+    assert code == 1
+    assert [line['status'] for line in lines] == ['ok', 'error', 'error', 'error', 'ok']
+    assert 'FileNotFoundError' in lines[3]['error']
+    assert sorted(os.listdir(str(tmp_path / 'out'))) == ['map_0.png', 'map_4.png']
+
+
+def test_main_reports_broken_lines(tmp_path, capsys):
+    specs = tmp_path / 'specs.jsonl'
+    specs.write_text('{"width": 12, "height": 10, "seed": 1}\n{"width": 12, "hei\n{"width": 12, "height": 10, "seed": 2}\n')
+    manifest = tmp_path / 'manifest.jsonl'
+    code = main([str(specs), '--output-dir', str(tmp_path / 'out'), '--manifest', str(manifest), '--workers', '1'])
+    lines = sorted((json.loads(line) for line in manifest.read_text().splitlines()), key=lambda line: line['index'])
+    assert code == 1
+    assert [line['status'] for line in lines] == ['ok', 'error', 'ok']
+    assert 'Line 2' in lines[1]['error']
+    assert sorted(os.listdir(str(tmp_path / 'out'))) == ['map_0.png', 'map_2.png']
+    specs.write_text('not json at all\n')
+    assert main([str(specs), '--output-dir', str(tmp_path / 'out'), '--manifest', str(manifest)]) == 2
+    assert 'JSON or JSONL' in capsys.readouterr().err
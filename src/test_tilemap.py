@@ -1,4 +1,9 @@
+import numpy as np
+import pytest
 from tilemap import TileMap
+from tilemap_exceptions import InvalidData
+from tilemap_stats import TileMapStats
+from PIL import Image
 
 tilemap1 = TileMap(20, 30, [], {}, 10, 20)
 tilemap2 = TileMap(20, 30, ['water', 'land', 'sand'], {'black': (0, 0, 0)})
@@ -12,20 +17,11 @@ def test_colors_to_use():
 
 
 def test_central_pts_to_array():
-    ls_of_rows = [j for i in tilemap1.central_pts_to_array(
-        tilemap1.zeros_array.tolist(),
-        TileMap.amount_central_pts
-        (
-         tilemap1.width,
-         tilemap1.height,
-         tilemap1.grounds,
-         tilemap1.own_grounds,
-         tilemap1.min_pts,
-         tilemap1.max_pts
-        )
-    ) for j in i]
-    assert ((51, 153, 255) in ls_of_rows) is True
-    assert ((125, 200, 100) in ls_of_rows) is True
+    central_pts_array = tilemap1.central_pts_to_array(
+        np.zeros_like(tilemap1.zeros_array), tilemap1.chosen_pts)
+    assert (1 in central_pts_array) is True
+    assert (2 in central_pts_array) is True
+    assert np.count_nonzero(central_pts_array) == len(tilemap1.chosen_pts)
 
 
 def test_amount_central_pts():
@@ -72,11 +68,213 @@ def test_amount_central_pts():
 
 
 def test_measure_distances():
-    ls_of_rows = [j for i in tilemap1.measure_distances(
-                  tilemap1.list_central_pts)
-                  for j in i]
-    assert (0 in ls_of_rows) is False
+    labels = tilemap1.measure_distances(tilemap1.central_pts_array)
+    assert labels.shape == (tilemap1.height, tilemap1.width)
+    assert labels.dtype == np.uint8
+    assert (labels < len(tilemap1.palette)).all()
 
 
 def test_expand_image():
     assert tilemap1.expand_image().size == (tilemap1.width*16, tilemap1.height*16)
+
+
+def test_measure_distances_chooses_nearest_ground():
+    rgb_array = tilemap2.rgb_array
+    for x in range(tilemap2.height):
+        for y in range(tilemap2.width):
+            distances = {pt: (x - pt[0])**2 + (y - pt[1])**2 for pt in tilemap2.chosen_pts}
+            nearest = {tilemap2.chosen_pts[pt] for pt, dist in distances.items()
+                       if dist == min(distances.values())}
+            assert tuple(rgb_array[x, y]) in nearest
+
+
+def test_image_with_palette(tmp_path):
+    assert tilemap2.image.mode == 'P'
+    assert (np.array(tilemap2.image.convert('RGB')) == tilemap2.rgb_array).all()
+    tilemap2.save(str(tmp_path / 'map.png'))
+    tilemap2.save(str(tmp_path / 'map.jpg'))
+    assert (np.array(Image.open(str(tmp_path / 'map.png')).convert('RGB')) ==
+            np.array(tilemap2.img_with_grid().convert('RGB'))).all()
+
+
+def test_img_with_grid():
+    rgb_array = tilemap1.rgb_array
+    grid = np.array(tilemap1.img_with_grid().convert('RGB'))
+    assert grid.shape == (tilemap1.height*16, tilemap1.width*16, 3)
+    assert (grid[::16] == 0).all() and (grid[:, ::16] == 0).all()
+    assert (grid[1::16, 1::16] == rgb_array).all()
+    assert (grid[15::16, 15::16] == rgb_array).all()
+    assert tilemap1.img_with_grid(3).size == (tilemap1.width*3, tilemap1.height*3)
+    assert (np.array(tilemap1.expand_image(2).convert('RGB'))[1::2, 1::2] == rgb_array).all()
+
+
+def test_same_seed_same_map():
+    first = TileMap(40, 30, ['water', 'sand', 'forest'], {}, 30, 60, seed=12)
+    second = TileMap(40, 30, ['water', 'sand', 'forest'], {}, 30, 60, 'brute', seed=np.random.default_rng(12))
+    third = TileMap(40, 30, ['water', 'sand', 'forest'], {}, 30, 60, 'grid', seed=12)
+    assert first.chosen_pts == second.chosen_pts == third.chosen_pts
+    assert (first.labels == second.labels).all() and (first.labels == third.labels).all()
+    assert first.seed == 12 and second.seed is None
+    assert TileMap(40, 30, seed=13).chosen_pts != TileMap(40, 30, seed=14).chosen_pts
+
+
+def test_stages_are_lazy():
+    tmap = TileMap(30, 20, seed=2)
+    assert 'chosen_pts' not in tmap.__dict__
+    assert len(tmap.every_zero[0]) == 30 * 20 - len(tmap.chosen_pts)
+    assert 'labels' not in tmap.__dict__
+    labels = tmap.labels
+    assert 'every_zero' not in tmap.__dict__ and 'central_pts_array' not in tmap.__dict__
+    assert 'rgb_array' not in tmap.__dict__ and 'image' not in tmap.__dict__
+    assert tmap.labels is labels
+    assert (labels == TileMap(30, 20, seed=2).labels).all()
+
+
+def test_stats(tmp_path):
+    stats = TileMapStats()
+    tmap = TileMap(30, 30, [], {}, 2, 2, 'brute', seed=1, stats=stats)
+    tmap.save(str(tmp_path / 'map.png'), 2)
+    assert [record['stage'] for record in stats.records] == [
+        'chosen_pts', 'central_pts_array', 'labels', 'save']
+    labels = stats.records[2]
+    assert labels['pixels'] == 900 and labels['central_pts'] == 2
+    assert labels['peak_bytes'] > 0 and labels['seconds'] > 0
+    (x1, y1), (x2, y2) = tmap.chosen_pts
+    ties = sum(1 for x in range(30) for y in range(30)
+               if (x - x1)**2 + (y - y1)**2 == (x - x2)**2 + (y - y2)**2)
+    assert labels['ties'] == ties
+    assert set(stats.seconds()) == {'chosen_pts', 'central_pts_array', 'labels', 'save'}
+
+
+def regenerated(tmap):
+    full = TileMap(tmap.width, tmap.height, tmap.grounds, tmap.own_grounds, seed=tmap.seed)
+    full.__dict__['chosen_pts'] = dict(tmap.chosen_pts)
+    return full.labels
+
+
+def test_incremental_updates():
+    tmap = TileMap(70, 50, ['water', 'sand', 'forest'], {}, 40, 60, seed=6)
+    before = tmap.labels.copy()
+    changes = tmap.add_central_pt((25, 35), TileMap.rgb_of_grounds['forest'])
+    changes += tmap.move_central_pt(list(tmap.chosen_pts)[0], (3, 3))
+    changes += tmap.remove_central_pt(list(tmap.chosen_pts)[5])
+    changes += tmap.add_central_pt((0, 69), TileMap.rgb_of_grounds['sand'])
+    assert (tmap.labels == regenerated(tmap)).all()
+    outside = np.ones_like(before, dtype=bool)
+    for x_start, x_end, y_start, y_end in changes:
+        outside[x_start:x_end, y_start:y_end] = False
+    assert (tmap.labels[outside] == before[outside]).all()
+    assert tmap.labels[25, 35] == 2
+
+
+def test_incremental_updates_with_ties():
+    tmap = TileMap(21, 21, [], {}, 2, 2, seed=1)
+    tmap.__dict__['chosen_pts'] = {(10, 2): (51, 153, 255), (10, 18): (125, 200, 100)}
+    tmap.add_central_pt((2, 10), (51, 153, 255))
+    tmap.add_central_pt((18, 10), (125, 200, 100))
+    tmap.remove_central_pt((10, 2))
+    tmap.move_central_pt((10, 18), (10, 2))
+    assert (tmap.labels == regenerated(tmap)).all()
+    with pytest.raises(InvalidData):
+        tmap.add_central_pt((2, 10), (51, 153, 255))
+    with pytest.raises(InvalidData):
+        tmap.add_central_pt((30, 10), (51, 153, 255))
+    with pytest.raises(InvalidData):
+        tmap.add_central_pt((3, 10), (1, 2, 3))
+
+
+def test_from_file_reads_saved_map(tmp_path):
+    tmap = TileMap(37, 23, ['water', 'sand', 'snow'], {'lava': (255, 80, 0), 'black': (0, 0, 0)}, seed=5)
+    tmap.save(str(tmp_path / 'map.png'), 6)
+    loaded = TileMap.from_file(str(tmp_path / 'map.png'), {'lava': (255, 80, 0)})
+    assert (loaded.width, loaded.height) == (37, 23)
+    assert (loaded.palette[loaded.labels] == tmap.palette[tmap.labels]).all()
+    assert set(loaded.own_grounds) <= {'lava', '#000000'}
+    assert loaded.chosen_pts == {}
+    assert sum(loaded.ground_areas.values()) == 37 * 23
+    for edit in (lambda: loaded.region_areas, lambda: loaded.adjacency, loaded.progressive_labels,
+                 lambda: loaded.add_central_pt((1, 1), (51, 153, 255)), lambda: loaded.remove_central_pt((1, 1))):
+        with pytest.raises(InvalidData):
+            edit()
+    tmap.expand_image(3).convert('RGB').save(str(tmp_path / 'expanded.png'))
+    expanded = TileMap.from_file(str(tmp_path / 'expanded.png'))
+    assert (expanded.palette[expanded.labels] == tmap.palette[tmap.labels]).all()
+
+
+def test_from_file_reads_map_bigger_than_pillow_limit(tmp_path):
+    tmap = TileMap(850, 850, ['water', 'sand', 'snow'], {}, 100, 100, seed=2)
+    tmap.save(str(tmp_path / 'big.png'))
+    assert (850 * 16)**2 > Image.MAX_IMAGE_PIXELS
+    loaded = TileMap.from_file(str(tmp_path / 'big.png'))
+    assert (loaded.palette[loaded.labels] == tmap.palette[tmap.labels]).all()
+    assert Image.MAX_IMAGE_PIXELS is not None
+
+
+def test_workers_do_not_change_map():
+    tmap = TileMap(90, 60, ['water', 'sand', 'snow'], {}, 40, 40, seed=9)
+    threaded = TileMap(90, 60, ['water', 'sand', 'snow'], {}, 40, 40, seed=9, workers=4)
+    assert (threaded.labels == tmap.labels).all()
+    assert (threaded.regions == tmap.regions).all()
+
+
+def test_processes_do_not_change_map():
+    counts, shared_counts = dict(), dict()
+    for assignment in ('brute', 'grid'):
+        tmap = TileMap(90, 60, ['water', 'sand', 'snow'], {}, 40, 40, assignment, seed=9)
+        sharded = TileMap(90, 60, ['water', 'sand', 'snow'], {}, 40, 40, assignment, seed=9, processes=2)
+        labels = tmap.measure_distances(tmap.central_pts_array, counts)
+        assert (sharded.measure_distances(sharded.central_pts_array, shared_counts) == labels).all()
+        assert shared_counts == counts
+        assert (sharded.regions == tmap.regions).all()
+
+
+def test_regions_made_with_labels():
+    for assignment in ('brute', 'jump_flood'):
+        tmap = TileMap(90, 60, ['water', 'sand', 'snow'], {}, 40, 40, assignment, seed=9)
+        labels = tmap.labels
+        assert 'regions' in tmap.__dict__
+        grounds = np.array([tmap.colors_to_use().index(tmap.chosen_pts[point]) for point in tmap.region_pts])
+        assert (grounds[tmap.regions] == labels).all()
+
+
+def test_analytics():
+    tmap = TileMap(30, 20, ['water', 'sand'], {'lava': (255, 80, 0)}, 12, 12, seed=4)
+    colors = tmap.colors_to_use()
+    assert tmap.ground_areas == {
+        name: int((tmap.labels == colors.index(rgb)).sum())
+        for name, rgb in [('water', colors[0]), ('sand', colors[1]), ('lava', (255, 80, 0))]}
+    regions = tmap.regions
+    assert sum(tmap.region_areas.values()) == 600
+    for index, point in enumerate(tmap.region_pts):
+        assert tmap.region_areas[point] == (regions == index).sum()
+    expected = {point: set() for point in tmap.chosen_pts}
+    for x in range(20):
+        for y in range(30):
+            for dx, dy in ((0, 1), (1, 0)):
+                if x + dx < 20 and y + dy < 30 and regions[x, y] != regions[x + dx, y + dy]:
+                    first, second = tmap.region_pts[regions[x, y]], tmap.region_pts[regions[x + dx, y + dy]]
+                    expected[first].add(second)
+                    expected[second].add(first)
+    assert tmap.adjacency == expected
+    assert tmap.adjacency is tmap.adjacency
+    tmap.region_arrays()
+    assert 'adjacency' in tmap.__dict__
+    point = next(iter(tmap.chosen_pts))
+    tmap.remove_central_pt(point)
+    assert point not in tmap.region_areas and point not in tmap.adjacency
+    assert sum(tmap.region_areas.values()) == 600
+    assert sum(tmap.ground_areas.values()) == 600
+
+
+def test_progressive_labels():
+    tmap = TileMap(50, 35, ['water', 'sand', 'snow'], {}, 20, 20, seed=6)
+    passes = []
+    labels = tmap.progressive_labels(lambda labels, size: passes.append((labels.shape, size)))
+    assert passes == [((5, 7), 8), ((9, 13), 4), ((18, 25), 2), ((35, 50), 1)]
+    assert tmap.labels is labels
+    assert (labels == TileMap(50, 35, ['water', 'sand', 'snow'], {}, 20, 20, seed=6).labels).all()
+    exact_stats, progressive_stats = TileMapStats(), TileMapStats()
+    TileMap(50, 35, ['water', 'sand', 'snow'], {}, 20, 20, 'brute', seed=6, stats=exact_stats).labels
+    TileMap(50, 35, ['water', 'sand', 'snow'], {}, 20, 20, seed=6, stats=progressive_stats).progressive_labels()
+    exact, progressive = exact_stats.records[-1], progressive_stats.records[-1]
+    assert progressive['stage'] == 'labels' and progressive['ties'] == exact['ties'] > 0
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+import tilemap_assignment
+from math import sqrt
+from tilemap_exceptions import InvalidData
+from tilemap_assignment import (
+    nearest_central_pts,
+    assign_window,
+    assign_map,
+    choose_assignment,
+    CentralPtsGrid,
+    jump_flood,
+    progressive_assign,
+    )
+
+central_x = np.array([0, 3, 7, 12, 12, 19])
+central_y = np.array([0, 9, 4, 15, 2, 10])
+
+
+def nearest_by_loop(x, y):
+    distances = [sqrt((x - cx)**2 + (y - cy)**2) for cx, cy in zip(central_x, central_y)]
+    return [i for i, dist in enumerate(distances) if dist == min(distances)]
+
+
+def test_assign_window_matches_loop():
+    window = assign_window(central_x, central_y, 16, 7, 0, 20, 0, 16)
+    for x in range(20):
+        for y in range(16):
+            nearest = nearest_by_loop(x, y)
+            assert window[x, y] in nearest
+            if len(nearest) == 1:
+                assert window[x, y] == nearest[0]
+
+
+def test_ties_do_not_depend_on_blocks(monkeypatch):
+    window = assign_window(central_x, central_y, 16, 7, 0, 20, 0, 16)
+    monkeypatch.setattr(tilemap_assignment, 'BLOCK_SIZE', 10)
+    assert (assign_window(central_x, central_y, 16, 7, 0, 20, 0, 16) == window).all()
+    assert (assign_window(central_x, central_y, 16, 7, 5, 13, 3, 11) == window[5:13, 3:11]).all()
+    pts_x, pts_y = np.nonzero(np.ones((20, 16)))
+    assert (nearest_central_pts(pts_x, pts_y, central_x, central_y, 16, 7) == window.ravel()).all()
+
+
+def test_ties_are_random():
+    central_x, central_y = np.array([0, 0]), np.array([0, 2])
+    chosen = {assign_window(central_x, central_y, 3, salt, 0, 20, 1, 2)[x, 0]
+              for salt in range(10) for x in range(20)}
+    assert chosen == {0, 1}
+
+
+def test_grid_matches_brute_force():
+    rng = np.random.default_rng(3)
+    flat = rng.choice(60 * 45, 200, replace=False)
+    many_x, many_y = flat // 45, flat % 45
+    brute = assign_window(many_x, many_y, 45, 11, 0, 60, 0, 45)
+    grid = CentralPtsGrid(many_x, many_y, 60, 45)
+    assert (grid.assign_window(11, 0, 60, 0, 45) == brute).all()
+    assert (CentralPtsGrid(many_x, many_y, 60, 45, 3).assign_window(11, 0, 60, 0, 45, 5) == brute).all()
+    assert (assign_map(central_x, central_y, 20, 16, 7, 'grid') == assign_map(central_x, central_y, 20, 16, 7, 'brute')).all()
+    with pytest.raises(InvalidData):
+        CentralPtsGrid(np.array([], dtype=np.int64), np.array([], dtype=np.int64), 60, 45)
+
+
+def test_bands_do_not_depend_on_workers():
+    rng = np.random.default_rng(5)
+    flat = rng.choice(70 * 33, 120, replace=False)
+    many_x, many_y = flat // 33, flat % 33
+    for assignment in ('brute', 'grid'):
+        counts = dict()
+        single = assign_map(many_x, many_y, 70, 33, 4, assignment, counts)
+        for workers in (2, 3, 16):
+            workers_counts = dict()
+            assert (assign_map(many_x, many_y, 70, 33, 4, assignment, workers_counts, workers) == single).all()
+            assert workers_counts == counts
+
+
+def test_choose_assignment():
+    assert choose_assignment(5) == 'brute'
+    assert choose_assignment(5000) == 'grid'
+
+
+def test_jump_flood_disagreement():
+    rng = np.random.default_rng(5)
+    rows, cols = np.mgrid[:90, :70]
+    for amount in (3, 40, 600):
+        flat = rng.choice(90 * 70, amount, replace=False)
+        many_x, many_y = flat // 70, flat % 70
+        exact = assign_window(many_x, many_y, 70, 1, 0, 90, 0, 70)
+        approximate = jump_flood(many_x, many_y, 90, 70, 1)
+        assert (approximate[many_x, many_y] == np.arange(amount)).all()
+        assert (approximate != exact).mean() < 0.005
+        exact_dist = np.sqrt((rows - many_x[exact])**2 + (cols - many_y[exact])**2)
+        approximate_dist = np.sqrt((rows - many_x[approximate])**2 + (cols - many_y[approximate])**2)
+        assert (approximate_dist - exact_dist).max() < 1
+    # Tight clusters of central points have no bound of one pixel
+    rng = np.random.default_rng(187)
+    centers = rng.uniform([0, 0], [204, 215], (3, 2))
+    clustered = np.rint(np.repeat(centers, 60, axis=0) + rng.normal(0, 5, (180, 2))).astype(np.int64)
+    flat = np.unique(clustered[:, 0].clip(0, 203) * 215 + clustered[:, 1].clip(0, 214))
+    many_x, many_y = flat // 215, flat % 215
+    rows, cols = np.mgrid[:204, :215]
+    exact = assign_window(many_x, many_y, 215, 1, 0, 204, 0, 215)
+    approximate = jump_flood(many_x, many_y, 204, 215, 1)
+    assert (approximate[many_x, many_y] == np.arange(len(flat))).all()
+    assert (approximate != exact).mean() < 0.05
+    exact_dist = np.sqrt((rows - many_x[exact])**2 + (cols - many_y[exact])**2)
+    approximate_dist = np.sqrt((rows - many_x[approximate])**2 + (cols - many_y[approximate])**2)
+    assert 1 < (approximate_dist - exact_dist).max() < 4
+
+
+def test_progressive_assign_is_exact():
+    rng = np.random.default_rng(7)
+    for height, width, amount in ((37, 51, 10), (63, 65, 80), (1, 30, 2), (30, 1, 3)):
+        flat = rng.choice(height * width, amount, replace=False)
+        many_x, many_y = flat // width, flat % width
+        exact = assign_map(many_x, many_y, height, width, 5)
+        for factor in (1, 3, 8, 16):
+            assert (progressive_assign(many_x, many_y, height, width, 5, factor=factor) == exact).all()
+    lattice_x, lattice_y = np.array([0, 0, 20, 20, 10]), np.array([0, 20, 0, 20, 10])
+    assert (progressive_assign(lattice_x, lattice_y, 21, 21, 3) == assign_map(lattice_x, lattice_y, 21, 21, 3)).all()
+
+
+def test_progressive_assign_passes():
+    passes = []
+    nearest = progressive_assign(central_x, central_y, 20, 16, 7, lambda grid, size: passes.append((grid.copy(), size)))
+    assert [(grid.shape, size) for grid, size in passes] == [((3, 2), 8), ((5, 4), 4), ((10, 8), 2), ((20, 16), 1)]
+    for grid, size in passes:
+        assert (grid == nearest[::size, ::size]).all()
@@ -0,0 +1,13 @@
+from tilemap import TileMap
+from tilemap_batch import generate_many
+
+
+def test_generate_many():
+    specs = [{'width': 20 + seed, 'height': 30, 'grounds': ['water', 'sand'], 'seed': seed} for seed in range(6)]
+    results = list(generate_many(specs, workers=2))
+    assert sorted(index for index, _, _ in results) == list(range(6))
+    for index, labels, palette in results:
+        tmap = TileMap(**specs[index])
+        assert (labels == tmap.labels).all()
+        assert (palette == tmap.palette).all()
+    assert [index for index, _, _ in generate_many(specs, workers=1)] == list(range(6))
@@ -0,0 +1,29 @@
+import os
+import numpy as np
+from tilemap import TileMap
+from tilemap_cache import MapCache
+
+
+def test_map_cache(tmp_path):
+    cache = MapCache(str(tmp_path), memory_items=1)
+    spec = {'width': 20, 'height': 30, 'grounds': ['water', 'sand'], 'seed': 3}
+    labels, palette = cache.get(spec)
+    assert (labels == TileMap(**spec).labels).all()
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.get(dict(spec, assignment='grid'))[0] is labels
+    cache.get(dict(spec, seed=4))
+    assert (cache.get(spec)[0] == labels).all()
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert MapCache.key(spec) != MapCache.key(dict(spec, assignment='jump_flood'))
+    cache.get({'width': 20, 'height': 30})
+    cache.get({'width': 20, 'height': 30, 'seed': np.random.default_rng(3)})
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_map_cache_eviction(tmp_path):
+    cache = MapCache(str(tmp_path), max_bytes=3000, memory_items=0)
+    for seed in range(5):
+        cache.get({'width': 30, 'height': 30, 'seed': seed})
+    files = os.listdir(str(tmp_path))
+    assert 0 < len(files) < 5
+    assert f"{MapCache.key({'width': 30, 'height': 30, 'seed': 4})}.npz" in files
@@ -0,0 +1,21 @@
+import numpy as np
+from tilemap import TileMap
+from tilemap_chunked import generate_chunked
+
+
+def test_generate_chunked_does_not_depend_on_chunks(tmp_path):
+    labels, chosen_pts, colors = generate_chunked(str(tmp_path / 'a.npy'), 50, 40, ['water', 'sand', 'snow'], chunk_size=7, seed=4)
+    whole = generate_chunked(str(tmp_path / 'b.npy'), 50, 40, ['water', 'sand', 'snow'], chunk_size=100, seed=4)[0]
+    assert labels.shape == (40, 50)
+    assert (labels == whole).all()
+    assert (np.load(str(tmp_path / 'a.npy'), mmap_mode='r') == whole).all()
+    for (x, y), ground in chosen_pts.items():
+        assert colors[labels[x, y]] == ground
+
+
+def test_generate_chunked_same_as_tilemap(tmp_path):
+    tmap = TileMap(60, 45, ['water', 'land', 'ice'], {'black': (0, 0, 0)}, 60, 90, seed=8)
+    labels, chosen_pts, colors = generate_chunked(
+        str(tmp_path / 'map.npy'), 60, 45, ['water', 'land', 'ice'], {'black': (0, 0, 0)}, 60, 90, chunk_size=16, seed=8)
+    assert chosen_pts == tmap.chosen_pts
+    assert (labels == tmap.labels).all()
@@ -3,7 +3,9 @@ from tilemap_exceptions import (
     InvalidData,
     verify_dimensions,
     verify_pts,
-    verify_grounds
+    verify_grounds,
+    verify_assignment,
+    verify_workers,
     )
 
 
@@ -42,3 +44,16 @@ def test_verify_grounds():
         verify_grounds(10, 10, own_grounds={'black': [0, 0, 0]})
         verify_grounds(10, 10, own_grounds={'black': (0, 0)})
         verify_grounds(10, 10, own_grounds={'black': (-1, 0, 300)})
+
+
+def test_verify_assignment():
+    with pytest.raises(InvalidData):
+        verify_assignment('kd-tree')
+
+
+def test_verify_workers():
+    verify_workers(None)
+    verify_workers(3)
+    for workers in (0, -1, 2.0, '4'):
+        with pytest.raises(InvalidData):
+            verify_workers(workers)
@@ -0,0 +1,40 @@
+import pytest
+from tilemap import TileMap
+from tilemap_exceptions import InvalidData
+from tilemap_format import MapFile, read_map, write_map
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib'])
+def test_read_region(tmp_path, compression):
+    tmap = TileMap(75, 50, ['water', 'sand', 'snow'], {'lava': (255, 80, 0)}, 30, 40, seed=6)
+    path = str(tmp_path / 'map.tmap')
+    write_map(tmap, path, compression, chunk_size=16)
+    with MapFile(path) as mapfile:
+        assert (mapfile.width, mapfile.height) == (75, 50)
+        assert (mapfile.palette == tmap.palette).all()
+        for window in [(0, 50, 0, 75), (3, 20, 40, 75), (17, 18, 5, 6), (10, 10, 0, 75)]:
+            x_start, x_end, y_start, y_end = window
+            assert (mapfile.read_region(*window) == tmap.labels[x_start:x_end, y_start:y_end]).all()
+        with pytest.raises(InvalidData):
+            mapfile.read_region(0, 51, 0, 10)
+
+
+def test_read_map_keeps_central_pts(tmp_path):
+    tmap = TileMap(40, 30, ['water', 'land', 'ice'], {}, 10, 20, seed=2)
+    tmap.add_central_pt((5, 7), TileMap.rgb_of_grounds['ice'])
+    path = str(tmp_path / 'map.tmap')
+    write_map(tmap, path, 'zlib')
+    loaded = read_map(path)
+    assert loaded.chosen_pts == tmap.chosen_pts
+    assert loaded.salt == tmap.salt and loaded.seed == 2
+    assert (loaded.labels == tmap.labels).all()
+    loaded.move_central_pt((5, 7), (20, 20))
+    tmap.move_central_pt((5, 7), (20, 20))
+    assert (loaded.labels == tmap.labels).all()
+
+
+def test_map_file_wrong_file(tmp_path):
+    path = tmp_path / 'map.png'
+    path.write_bytes(b'not a map at all, just some bytes')
+    with pytest.raises(InvalidData):
+        MapFile(str(path))
@@ -0,0 +1,20 @@
+from tilemap_help_functions import (
+    choose_random_indexes,
+    choose_central_pts,
+    )
+
+
+def test_choose_random_indexes():
+    assert sorted(choose_random_indexes(50, 50)) == list(range(50))
+    indexes = choose_random_indexes(10**12, 1000)
+    assert len(set(indexes)) == 1000
+    assert min(indexes) >= 0 and max(indexes) < 10**12
+
+
+def test_choose_central_pts():
+    central_pts = choose_central_pts(10, 10, 30, 4)
+    assert len(central_pts) == 30
+    assert set(central_pts.values()) == {0, 1, 2, 3}
+    central_pts = choose_central_pts(4, 5, 20, 7)
+    assert set(central_pts) == {(x, y) for x in range(4) for y in range(5)}
+    assert set(central_pts.values()) == set(range(7))
@@ -0,0 +1,30 @@
+import numpy as np
+from PIL import Image
+from tilemap import TileMap
+from tilemap_help_functions import add_black, expand_array, palette_image
+from tilemap_png import write_png
+
+
+def test_write_png_same_as_img_with_grid(tmp_path):
+    tmap = TileMap(45, 31, ['water', 'sand', 'snow'], {'black': (0, 0, 0)}, seed=3)
+    write_png(str(tmp_path / 'map.png'), tmap.labels, tmap.palette, 5)
+    image = Image.open(str(tmp_path / 'map.png'))
+    assert image.mode == 'P' and image.size == (45 * 5, 31 * 5)
+    assert (np.array(image.convert('RGB')) == np.array(tmap.img_with_grid(5).convert('RGB'))).all()
+    write_png(str(tmp_path / 'plain.png'), tmap.labels, tmap.palette, 3, grid=False)
+    assert (np.array(Image.open(str(tmp_path / 'plain.png')).convert('RGB')) ==
+            np.array(tmap.expand_image(3).convert('RGB'))).all()
+
+
+def test_write_png_many_colors(tmp_path):
+    rng = np.random.default_rng(1)
+    palette = rng.integers(1, 256, (300, 3), dtype=np.uint8)
+    labels = rng.integers(0, 300, (20, 17)).astype(np.uint16)
+    write_png(str(tmp_path / 'map.png'), labels, palette, 4, level=1)
+    image = Image.open(str(tmp_path / 'map.png'))
+    assert image.mode == 'RGB'
+    full_palette, black = add_black(palette)
+    expanded = expand_array(labels, 4)
+    expanded[::4, :] = black
+    expanded[:, ::4] = black
+    assert (np.array(image) == np.array(palette_image(expanded, full_palette))).all()
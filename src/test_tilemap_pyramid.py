@@ -0,0 +1,34 @@
+import numpy as np
+from PIL import Image
+from tilemap import TileMap
+from tilemap_pyramid import downsample_mode, export_pyramid, pyramid_levels
+
+
+def test_downsample_mode():
+    labels = np.array([[1, 1, 2, 3, 5],
+                       [0, 1, 3, 2, 6],
+                       [4, 4, 0, 1, 7]], dtype=np.uint8)
+    assert downsample_mode(labels).tolist() == [[1, 2, 5], [4, 0, 7]]
+
+
+def test_pyramid_levels():
+    assert pyramid_levels(10, 10, 16) == 1
+    assert pyramid_levels(100, 33, 16) == 4
+
+
+def test_export_pyramid_same_as_whole_levels(tmp_path):
+    tmap = TileMap(70, 45, ['water', 'sand', 'snow'], {}, 30, 30, seed=2)
+    levels, tiles = export_pyramid(tmap.labels, tmap.palette, str(tmp_path), tile_size=16)
+    assert levels == 4
+    level = tmap.labels
+    saved = 0
+    for zoom in range(levels - 1, -1, -1):
+        for column in range(-(-level.shape[1] // 16)):
+            for row in range(-(-level.shape[0] // 16)):
+                image = Image.open(tmp_path / str(zoom) / str(column) / f'{row}.png')
+                assert image.mode == 'P'
+                assert (np.array(image) == level[row * 16:row * 16 + 16, column * 16:column * 16 + 16]).all()
+                saved += 1
+        level = downsample_mode(level)
+    assert saved == tiles
+    assert tmap.export_pyramid(str(tmp_path / 'again'), 16) == (levels, tiles)
@@ -0,0 +1,44 @@
+from tilemap import TileMap
+from tilemap_server import TileServer
+import numpy as np
+import asyncio
+
+
+def test_tile_labels_match_map():
+    tmap = TileMap(100, 70, [], {}, 40, 40, seed=3)
+    server = TileServer(tmap, tile_size=32)
+    assert server.max_zoom == 2
+    for column in range(4):
+        for row in range(3):
+            labels = server.tile_labels(2, column, row)
+            window = tmap.labels[row * 32:row * 32 + 32, column * 32:column * 32 + 32]
+            assert np.array_equal(labels, window)
+    assert np.array_equal(server.tile_labels(1, 0, 0), tmap.labels[1:64:2, 1:64:2])
+    assert server.tile_labels(2, 4, 0) is None
+    assert server.tile_labels(3, 0, 0) is None
+
+
+def test_server_answers_requests():
+    tmap = TileMap(64, 64, [], {}, 10, 10, seed=1)
+    server = TileServer(tmap, tile_size=32)
+
+    async def request(port, path):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f'GET {path} HTTP/1.1\r\nConnection: close\r\n\r\n'.encode())
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async def run():
+        started = await server.start('127.0.0.1', 0)
+        port = started.sockets[0].getsockname()[1]
+        responses = [await request(port, path) for path in ('/1/1/0.png', '/1/1/0.png', '/5/0/0.png', '/')]
+        started.close()
+        await started.wait_closed()
+        return responses
+
+    tile, cached, outside, wrong = asyncio.run(run())
+    assert tile.startswith(b'HTTP/1.1 200 OK') and b'\x89PNG' in tile
+    assert cached == tile
+    assert outside.startswith(b'HTTP/1.1 404') and wrong.startswith(b'HTTP/1.1 404')
+    assert list(server.cache) == [(1, 1, 0), (5, 0, 0)]
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from tilemap import TileMap
+from tilemap_exceptions import InvalidData
+from tilemap_spec import MapSpec
+
+
+def test_from_tilemap_same_map():
+    tmap = TileMap(70, 45, ['water', 'sand', 'snow'], {'lava': (255, 80, 0)}, 60, 60, seed=3)
+    spec = MapSpec.from_tilemap(tmap)
+    assert (spec.rasterize(70, 45) == tmap.labels).all()
+    assert (spec.palette == tmap.palette).all()
+    assert spec.names == ['water', 'sand', 'snow', 'lava']
+
+
+def test_window_same_as_whole_map():
+    spec = MapSpec.random(200, ['water', 'forest', 'ice'], seed=8)
+    whole = spec.rasterize(300, 200)
+    assert (spec.rasterize(300, 200, (37, 120, 250, 300)) == whole[37:120, 250:300]).all()
+    small = MapSpec.random(5, seed=1)
+    assert (small.rasterize(40, 30, (3, 9, 0, 40)) == small.rasterize(40, 30)[3:9]).all()
+    with pytest.raises(InvalidData):
+        spec.rasterize(300, 200, (0, 201, 0, 10))
+
+
+def test_sizes_of_one_world():
+    spec = MapSpec.random(50, ['water', 'land', 'sand'], seed=2)
+    full = spec.rasterize(400, 400)
+    thumbnail = spec.rasterize(50, 50)
+    assert thumbnail.shape == (50, 50)
+    assert np.mean(thumbnail == full[4::8, 4::8]) > 0.9
+    assert set(np.unique(thumbnail)) == {0, 1, 2}
+    assert spec.image(20, 10).size == (20, 10)
+
+
+def test_json_round_trip():
+    spec = MapSpec.random(30, [], {'lava': (255, 80, 0), 'ash': (90, 90, 90)}, seed=6)
+    loaded = MapSpec.from_json(spec.to_json())
+    assert loaded.to_dict() == spec.to_dict()
+    assert (loaded.rasterize(123, 77) == spec.rasterize(123, 77)).all()
+    assert loaded.names == ['lava', 'ash'] and loaded.seed == 6
+    with pytest.raises(InvalidData):
+        MapSpec([(0.5, 1.5, 0)], [(0, 0, 0)])
+    with pytest.raises(InvalidData):
+        MapSpec([(0.5, 0.5, 1)], [(0, 0, 0)])
@@ -2,18 +2,41 @@ from tilemap_exceptions import (
     verify_dimensions,
     verify_pts,
     verify_grounds,
+    verify_assignment,
+    verify_central_pt,
+    verify_central_pts,
+    verify_workers,
+    InvalidData,
     )
 from tilemap_help_functions import (
     convert_to_np,
     find_every_zero,
     stack_array,
-    choose_random_coordinate,
-    add_to_set,
+    choose_central_pts,
+    labels_dtype,
+    palette_image,
+    expand_array,
+    add_black,
+    pack_rgb,
+    detect_cell_size,
+    read_row,
     )
-from PIL import Image, ImageDraw
+from tilemap_assignment import (
+    assign_map,
+    progressive_assign,
+    cell_bounds,
+    near_window,
+    nearest_central_pts,
+    mix_keys,
+    )
+from tilemap_stats import StageMeasurement
+from tilemap_pyramid import export_pyramid
+from tilemap_png import write_png
+from tilemap_shared import assign_shared
+from PIL import Image
+from functools import cached_property
+from contextlib import nullcontext
 import numpy as np
-from random import randint, choice
-from math import sqrt
 
 
 class TileMap:
@@ -35,7 +58,11 @@ class TileMap:
             'snow': (255, 255, 255),
     }
 
-    def __init__(self, width, height, grounds=None, own_grounds=None, min_pts=None, max_pts=None):
+    # Stages made from central points or 'labels', removed when they change
+    derived_stages = ('central_pts_array', 'copy', 'every_zero', 'cords_of_zeros',
+                      'rgb_array', 'image', 'ground_areas', 'region_areas', 'adjacency')
+
+    def __init__(self, width, height, grounds=None, own_grounds=None, min_pts=None, max_pts=None, assignment=None, seed=None, stats=None, workers=None, processes=None):
         """
         Initiates an TileMap object
 
@@ -52,27 +79,40 @@ class TileMap:
         :type min_pts: int
         :param max_pts: Determine maximal amount central points of grounds
         :type max_pts: int
-
-        :param chosen_pts: Chosen central points with its grounds
-        :type chosen_pts: dict
-        :param zeros_array: NumPy zeros array with same dimensions as Tile Map
-        :type zeros_array: numpy.ndarray
-        :param list_central_pts: List with randomly chosen
-        central points' grounds
-        :type list_central_pts: list
-        :param every_zero: Two NumPy arrays with coordinates
-        of every zero in list
-        with central points' grounds, first contains X-coordinates,
-        second contains Y-coordinates
-        :type every_zero: numpy.ndarray
-        :param cords_of_zeros: NumPy two dimensional array with coordinates of
-        every zeroin list with central points' grounds
-        :type cords_of_zeros: numpy.ndarray
-        :param rgb_array: NumPy array with RGB tuples with
-        colors of points' grounds
-        :type rgb_array: numpy.ndarray
-        :param image: Image made from rgb_array of a visualized pixels
-        :type image: PIL.Image.Image
+        :param assignment: Method of finding the nearest central points:
+        'brute' compares every pixel with every central point, 'grid'
+        compares pixels only with central points close to them,
+        'jump_flood' approximately propagates central points through
+        the Map, it is slower than 'grid' and kept for comparison
+        (by default chosen by amount of central points)
+        :type assignment: str
+        :param seed: Seed of generator of random numbers or generator itself,
+        Maps with same parameters and same seed are identical
+        :type seed: int or numpy.random.Generator
+        :param stats: Object of TileMapStats class or function called with
+        dictionary describing every finished stage (wall time, peak memory
+        allocation and amounts of pixels, central points and broken ties),
+        stages are not measured if it is not provided
+        :type stats: tilemap_stats.TileMapStats
+        :param workers: Amount of threads finding the nearest central points,
+        Map does not depend on it (by default one thread)
+        :type workers: int
+        :param processes: Amount of processes filling bands of rows of
+        a Map in shared memory, Map does not depend on it (by default
+        Map is made in current process, jump flooding always is)
+        :type processes: int
+
+        :param rng: Generator of random numbers used to construct Tile Map
+        :type rng: numpy.random.Generator
+        :param salt: Random number used to break ties between
+        equally distant central points
+        :type salt: int
+        :param palette: NumPy array with RGB tuples of grounds' colors
+        :type palette: numpy.ndarray
+
+        Tile Map is constructed in stages, every stage is computed
+        when it is accessed for the first time:
+        chosen_pts -> central_pts_array -> labels -> rgb_array, image
         """
 
         verify_dimensions(width, height, grounds, own_grounds)
@@ -84,114 +124,471 @@ class TileMap:
         verify_pts(width, height, grounds, own_grounds, min_pts, max_pts)
         self.min_pts = None if not min_pts else min_pts
         self.max_pts = None if not max_pts else max_pts
-        self.chosen_pts = dict()
-        self.zeros_array = np.zeros((self.height, self.width), dtype=int)
-        self.list_central_pts = self.central_pts_to_array(
-            self.zeros_array.tolist(),
-            TileMap.amount_central_pts(self.width, self.height, self.grounds, self.own_grounds, min_pts=min_pts, max_pts=max_pts))
-        self.copy = self.list_central_pts[:][:]
-        self.every_zero = find_every_zero(convert_to_np(self.copy))
-        self.cords_of_zeros = stack_array(self.every_zero[0], self.every_zero[1])
-        self.rgb_array = convert_to_np(self.measure_distances(self.list_central_pts), dtype=np.uint8)
-        self.image = Image.fromarray(self.rgb_array)
+        verify_assignment(assignment)
+        self.assignment = assignment
+        self.stats = stats
+        verify_workers(workers)
+        self.workers = workers
+        verify_workers(processes)
+        self.processes = processes
+        self.seed = None if isinstance(seed, np.random.Generator) else seed
+        self.rng = np.random.default_rng(seed)
+        self.salt = int(self.rng.integers(2**32))
+        self.palette = convert_to_np(self.colors_to_use(), dtype=np.uint8)
+
+    @classmethod
+    def from_file(cls, path, own_grounds=None, stats=None):
+        """
+        Classmethod that reconstructs Tile Map from image saved by 'save'
+        method or made by 'expand_image' method. Size of a square made from
+        every point is found from grid or from lengths of runs of colors,
+        then one pixel in the middle of every square is read. Colors of
+        grounds given in Class get their names, other colors are named
+        by 'own_grounds' or by their hexadecimal value. Image should be
+        saved in format without loss, like PNG
+
+        :param path: Path of an image
+        :type path: str
+        :param own_grounds: Dictionary of names and RGB tuples of grounds
+        that can be in image
+        :type own_grounds: dict
+        :returns: Tile Map with indexes of colors of grounds read from image,
+        its central points are unknown, so 'chosen_pts' is empty and
+        'regions', 'progressive_labels' and methods changing central points
+        raise InvalidData
+        :rtype: TileMap
+        """
 
-    def colors_to_use(self):
+        tmap = cls.__new__(cls)
+        tmap.stats = stats
+        tmap.workers = tmap.processes = None
+        with tmap.stage('from_file') as counts:
+            # Images saved by 'save' method are often bigger than the limit
+            # of Pillow against decompression bombs, so it is lifted here
+            max_pixels, Image.MAX_IMAGE_PIXELS = Image.MAX_IMAGE_PIXELS, None
+            try:
+                with Image.open(path) as image:
+                    table = None
+                    if image.mode == 'P':
+                        table = pack_rgb(np.array(image.getpalette(), dtype=np.uint8).reshape(-1, 3))
+                    size, _ = detect_cell_size(image, table)
+                    # Only the middle row of every row of squares is read
+                    sampled = np.stack([read_row(image, x, table, size // 2, size)
+                                        for x in range(size // 2, image.height, size)])
+                    counts['pixels'] = image.width * image.height
+            finally:
+                Image.MAX_IMAGE_PIXELS = max_pixels
+            keys, labels = np.unique(sampled, return_inverse=True)
+            names = {rgb: name for name, rgb in (own_grounds or {}).items()}
+            tmap.grounds = [name for name, rgb in cls.rgb_of_grounds.items() if pack_rgb(rgb) in keys]
+            tmap.own_grounds = dict()
+            for key in keys:
+                rgb = (int(key) >> 16, (int(key) >> 8) & 255, int(key) & 255)
+                if rgb not in cls.rgb_of_grounds.values():
+                    tmap.own_grounds[names.get(rgb, '#%02x%02x%02x' % rgb)] = rgb
+            tmap.width, tmap.height = sampled.shape[1], sampled.shape[0]
+            tmap.min_pts = tmap.max_pts = tmap.assignment = tmap.seed = None
+            tmap.rng = np.random.default_rng()
+            tmap.salt = int(tmap.rng.integers(2**32))
+            tmap.palette = convert_to_np(tmap.colors_to_use(), dtype=np.uint8)
+            # Colors sorted as numbers are matched with indexes in palette
+            order = np.argsort(pack_rgb(tmap.palette))
+            lookup = order[np.searchsorted(pack_rgb(tmap.palette), keys, sorter=order)]
+            tmap.labels = lookup[labels.reshape(sampled.shape)].astype(labels_dtype(len(tmap.palette)))
+            tmap.chosen_pts = dict()
+        return tmap
+
+    @cached_property
+    def chosen_pts(self):
+        """
+        Dictionary of randomly chosen central points with its grounds.
+        Every color of grounds is used at least one time
         """
-        Method that checks colors of grounds used to construct Tile Map
 
-        :returns: List of RGB tuples of grounds' colors used in Tile Map
-        :rtype: list
+        with self.stage('chosen_pts') as counts:
+            colors = self.colors_to_use()
+            amount = TileMap.amount_central_pts(
+                self.width, self.height, self.grounds, self.own_grounds, self.min_pts, self.max_pts, self.rng)
+            central_pts = choose_central_pts(self.height, self.width, amount, len(colors), self.rng)
+            counts['central_pts'] = amount
+            return {point: colors[ground] for point, ground in central_pts.items()}
+
+    @property
+    def zeros_array(self):
+        """
+        NumPy zeros array with same dimensions as Tile Map
         """
 
-        colors = []
-        if self.grounds:
-            for item in self.grounds:
-                colors.append(TileMap.rgb_of_grounds[item])
-        if self.own_grounds:
-            for item in self.own_grounds.values():
-                colors.append(item)
-        return colors if colors else [TileMap.rgb_of_grounds['water'], TileMap.rgb_of_grounds['land']]
+        return np.zeros((self.height, self.width), dtype=labels_dtype(len(self.palette) + 1))
 
-    def every_color_was_used(self):
+    @cached_property
+    def central_pts_array(self):
+        """
+        NumPy array with index of color increased by one in place
+        of every central point and zeros elsewhere
         """
-        Method that checks if every color of grounds has been already used
-        so that every color chosen by User will appear in Map at least one time
 
-        :returns: True if every color has been used at least one time,
-        otherwise False
-        :rtype: bool
+        chosen_pts = self.chosen_pts
+        with self.stage('central_pts_array', central_pts=len(chosen_pts)):
+            return self.central_pts_to_array(self.zeros_array, chosen_pts)
+
+    @cached_property
+    def copy(self):
+        """
+        Copy of array with central points
         """
 
-        if set(self.chosen_pts.values()) == set(self.colors_to_use()):
-            return True
-        else:
-            return False
+        return self.central_pts_array.copy()
 
-    def which_color_not_used(self):
+    @cached_property
+    def every_zero(self):
+        """
+        Two NumPy arrays with coordinates of every zero in array with
+        central points' grounds, first contains X-coordinates,
+        second contains Y-coordinates
         """
-        Method that checks which color of grounds has not been used so far
 
-        :returns: List of not used colors
-        :rtype: list
+        return find_every_zero(self.copy)
+
+    @cached_property
+    def cords_of_zeros(self):
+        """
+        NumPy two dimensional array with coordinates of every zero
+        in array with central points' grounds
         """
 
-        not_used_colors = []
-        for color in self.colors_to_use():
-            if color not in self.chosen_pts.values():
-                not_used_colors.append(color)
-        return not_used_colors
+        return stack_array(self.every_zero[0], self.every_zero[1])
 
-    def central_pts_to_array(self, zeros_array, amount_central_pts):
+    @cached_property
+    def labels(self):
+        """
+        NumPy array with index of color in palette of every point of a Map.
+        Arrays used to find central points are not needed after it is made,
+        so they are removed and will be made again if they are accessed
         """
-        Method that applies particular amount of central points to zeros array
 
-        :param zeros_array: NumPy array full of zeros with dimensions same as
-        dimensions of Map
-        :type zeros_array: numpy.ndarray
-        :param amount_central_pts: Amount of central points to choose
-        :type amount_central_pts: int
-        :returns: Modified zeros list with RGB tuples of central points applied
+        central_pts_array = self.central_pts_array
+        with self.stage('labels', pixels=self.width * self.height, central_pts=len(self.chosen_pts), ties=0) as counts:
+            labels = self.measure_distances(central_pts_array, counts if self.stats else None)
+        self.drop_stages()
+        return labels
+
+    def progressive_labels(self, callback=None, factor=8):
+        """
+        Method that makes 'labels' in passes, first for blocks of 'factor'
+        x 'factor' points, then for smaller blocks only on borders of
+        grounds' areas. Final result is the same as 'labels' made at once
+        by exact assignment. Passes always search central points in grid
+        of buckets in current process, so 'assignment', 'workers'
+        and 'processes' are not used
+
+        :param callback: Function called after every pass with array
+        with indexes of colors of Map in 1/size of its resolution
+        and size of blocks, the last call gets the whole Map
+        :type callback: function
+        :param factor: Length of side of the first blocks
+        :type factor: int
+        :returns: Array with index of color of every point
+        :rtype: numpy.ndarray
+        """
+
+        verify_central_pts(self.chosen_pts)
+        central_pts_array = self.central_pts_array
+        with self.stage('labels', pixels=self.width * self.height, central_pts=len(self.chosen_pts), ties=0) as counts:
+            central_x, central_y = np.nonzero(central_pts_array)
+            grounds = (central_pts_array[central_x, central_y] - 1).astype(labels_dtype(len(self.palette)))
+
+            def preview(nearest, size):
+                callback(grounds[nearest], size)
+
+            nearest = progressive_assign(central_x, central_y, self.height, self.width, self.salt,
+                                         preview if callback else None, factor, counts if self.stats else None)
+            self.labels = grounds[nearest]
+        self.region_pts = list(zip(central_x.tolist(), central_y.tolist()))
+        self.regions = nearest.astype(np.int32, copy=False)
+        self.drop_stages()
+        return self.labels
+
+    @cached_property
+    def regions(self):
+        """
+        NumPy array with index of the nearest central point in list
+        'region_pts' of every point of a Map. It is made together with
+        'labels', so it is searched again only for Map which 'labels' were
+        given without it. Removed central points are replaced by None
+        in that list, so indexes do not change
+        """
+
+        verify_central_pts(self.chosen_pts)
+        if 'labels' not in self.__dict__:
+            self.labels
+            return self.__dict__['regions']
+        central_pts_array = self.central_pts_array
+        with self.stage('regions', pixels=self.width * self.height, central_pts=len(self.chosen_pts), ties=0) as counts:
+            self.measure_distances(central_pts_array, counts if self.stats else None)
+        self.drop_stages()
+        return self.__dict__['regions']
+
+    @cached_property
+    def ground_areas(self):
+        """
+        Dictionary of names of grounds with amounts of their points
+        """
+
+        labels = self.labels
+        with self.stage('ground_areas', pixels=labels.size):
+            areas = np.bincount(labels.ravel(), minlength=len(self.palette))
+            names = list(self.grounds) + list(self.own_grounds)
+            return {name: int(area) for name, area in zip(names, areas)}
+
+    @cached_property
+    def region_areas(self):
+        """
+        Dictionary of central points with amounts of points
+        for which they are the nearest central points
+        """
+
+        regions = self.regions
+        with self.stage('region_areas', pixels=regions.size):
+            areas = np.bincount(regions.ravel(), minlength=len(self.region_pts))
+            return {point: int(area) for point, area in zip(self.region_pts, areas) if point is not None}
+
+    @cached_property
+    def adjacency(self):
+        """
+        Dictionary of central points with sets of central points whose
+        areas touch their areas by side of any point. Every pair of points
+        next to each other in row or column is compared at once
+        """
+
+        regions = self.regions
+        with self.stage('adjacency', pixels=regions.size):
+            first = np.concatenate((regions[:, :-1].ravel(), regions[:-1, :].ravel()))
+            second = np.concatenate((regions[:, 1:].ravel(), regions[1:, :].ravel()))
+            border = first != second
+            low = np.minimum(first[border], second[border]).astype(np.int64)
+            high = np.maximum(first[border], second[border]).astype(np.int64)
+            pairs = np.unique(low * len(self.region_pts) + high)
+            graph = {point: set() for point in self.region_pts if point is not None}
+            for low, high in zip((pairs // len(self.region_pts)).tolist(), (pairs % len(self.region_pts)).tolist()):
+                graph[self.region_pts[low]].add(self.region_pts[high])
+                graph[self.region_pts[high]].add(self.region_pts[low])
+            return graph
+
+    def add_central_pt(self, point, ground):
+        """
+        Method that adds central point and recomputes only pixels
+        which become closer to it than to their central points
+
+        :param point: Coordinates (x, y) of new central point
+        :type point: tuple
+        :param ground: RGB tuple of ground of new central point
+        :type ground: tuple
+        :returns: List with window (x_start, x_end, y_start, y_end)
+        of a Map that has changed
         :rtype: list
         """
 
+        verify_central_pts(self.chosen_pts)
+        verify_central_pt(self.width, self.height, point, self.colors_to_use(), ground)
+        if point in self.chosen_pts:
+            raise InvalidData(f"Central point {point} already exists")
+        regions, labels = self.regions, self.labels
+        central_x, central_y, alive = self.region_arrays()
+        x_start, x_end, y_start, y_end = cell_bounds(
+            point[0], point[1], central_x[alive], central_y[alive], self.height, self.width)
+        rows = np.arange(x_start, x_end)[:, None]
+        cols = np.arange(y_start, y_end)[None, :]
+        owners = regions[x_start:x_end, y_start:y_end]
+        old_dist = (rows - central_x[owners])**2 + (cols - central_y[owners])**2
+        new_dist = (rows - point[0])**2 + (cols - point[1])**2
+        won = new_dist < old_dist
+        tied = new_dist == old_dist
+        if tied.any():
+            pixel_keys = (rows * self.width + cols)[tied]
+            owner_keys = central_x[owners[tied]] * self.width + central_y[owners[tied]]
+            won[tied] = mix_keys(pixel_keys, point[0] * self.width + point[1], self.salt) > \
+                mix_keys(pixel_keys, owner_keys, self.salt)
+        self.region_pts.append(point)
+        self.chosen_pts[point] = ground
+        owners[won] = len(self.region_pts) - 1
+        labels[x_start:x_end, y_start:y_end][won] = self.colors_to_use().index(ground)
+        self.drop_stages()
+        return [self.changed_window(won, x_start, y_start)]
+
+    def remove_central_pt(self, point):
+        """
+        Method that removes central point and recomputes only pixels
+        which were the closest to it
+
+        :param point: Coordinates (x, y) of central point
+        :type point: tuple
+        :returns: List with window (x_start, x_end, y_start, y_end)
+        of a Map that has changed
+        :rtype: list
+        """
+
+        verify_central_pts(self.chosen_pts)
+        verify_central_pt(self.width, self.height, point)
+        if point not in self.chosen_pts:
+            raise InvalidData(f"Central point {point} does not exist")
+        if len(self.chosen_pts) == 1:
+            raise InvalidData(f"Last central point cannot be removed")
+        regions, labels = self.regions, self.labels
+        index = self.region_pts.index(point)
+        self.region_pts[index] = None
+        del self.chosen_pts[point]
+        central_x, central_y, alive = self.region_arrays()
+        alive = np.flatnonzero(alive)
+        x_start, x_end, y_start, y_end = cell_bounds(
+            point[0], point[1], central_x[alive], central_y[alive], self.height, self.width)
+        owners = regions[x_start:x_end, y_start:y_end]
+        lost = owners == index
+        pts_x, pts_y = np.nonzero(lost)
+        candidates = alive[near_window(central_x[alive], central_y[alive], x_start, x_end, y_start, y_end)]
+        nearest = candidates[nearest_central_pts(
+            pts_x + x_start, pts_y + y_start, central_x[candidates], central_y[candidates], self.width, self.salt)]
+        owners[lost] = nearest
         colors = self.colors_to_use()
-        used_colors = set()
-        while amount_central_pts > 0:
-            # Chooses a random point in list to be central point
-            # of a particular ground
-            central_x, central_y = choose_random_coordinate(self.height, self.width)
-            # Checks if point has not been already chosen to be a ground
-            if zeros_array[central_x][central_y] not in colors:
-                if ((self.every_color_was_used()) or (amount_central_pts > (len(self.grounds) - len(used_colors)))):
-                    add_to_set(used_colors, choice(colors))
-                    self.apply_to_list(central_x, central_y, zeros_array, choice(colors))
-                # Guarantees that every ground will be chosen at least one time
-                elif (not self.every_color_was_used()) and (amount_central_pts == (len(self.grounds) - len(used_colors))):
-                    add_to_set(used_colors, self.which_color_not_used()[0])
-                    self.apply_to_list(central_x, central_y, zeros_array, self.which_color_not_used()[0])
-                amount_central_pts -= 1
-        return zeros_array
+        grounds = np.array([colors.index(self.chosen_pts[self.region_pts[owner]]) for owner in nearest.tolist()])
+        labels[x_start:x_end, y_start:y_end][lost] = grounds
+        self.drop_stages()
+        return [self.changed_window(lost, x_start, y_start)]
 
-    def apply_to_list(self, x, y, ls, ground):
+    def move_central_pt(self, point, new_point):
         """
-        Method that changes value of element in list and adds
-        central point with its ground as an item in dictionary
+        Method that moves central point with its ground to new coordinates
 
-        :param x: X-coordinate of element in a list
-        :type x: int
-        :param y: Y-coordinate of element in a list
-        :type y: int
-        :param ls: List of elements to edit
-        :type ls: list
-        :param ground: Type of ground of a particular element in list
-        :type ground: tuple
+        :returns: List with windows (x_start, x_end, y_start, y_end)
+        of a Map that have changed
+        :rtype: list
+        """
+
+        verify_central_pts(self.chosen_pts)
+        if point not in self.chosen_pts:
+            raise InvalidData(f"Central point {point} does not exist")
+        ground = self.chosen_pts[point]
+        return self.add_central_pt(new_point, ground) + self.remove_central_pt(point)
+
+    def region_arrays(self):
         """
+        Method that makes arrays of coordinates of central points
+        from list 'region_pts' and mask of not removed central points
 
-        ls[x][y] = ground
-        self.chosen_pts[x, y] = ground
+        :rtype: tuple
+        """
+
+        alive = np.array([point is not None for point in self.region_pts])
+        central_x = np.array([point[0] if point else 0 for point in self.region_pts])
+        central_y = np.array([point[1] if point else 0 for point in self.region_pts])
+        return central_x, central_y, alive
+
+    def drop_stages(self, *names):
+        """
+        Method that removes computed stages, so they will be made again
+        from current central points and 'labels' when they are accessed
+
+        :param names: Names of stages, by default every stage
+        from 'derived_stages'
+        :type names: str
+        """
+
+        for name in names or self.derived_stages:
+            self.__dict__.pop(name, None)
 
     @staticmethod
-    def amount_central_pts(width, height, grounds, own_grounds, min_pts=None, max_pts=None):
+    def changed_window(changed, x_start, y_start):
+        """
+        Staticmethod that finds the smallest window containing
+        every changed pixel of a part of a Map
+
+        :param changed: Mask of changed pixels of a part of a Map
+        :type changed: numpy.ndarray
+        :returns: Window as tuple (x_start, x_end, y_start, y_end),
+        empty if nothing has changed
+        :rtype: tuple
+        """
+
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        if not len(rows):
+            return (x_start, x_start, y_start, y_start)
+        return (x_start + rows[0], x_start + rows[-1] + 1, y_start + cols[0], y_start + cols[-1] + 1)
+
+    @cached_property
+    def rgb_array(self):
+        """
+        NumPy array with RGB tuples with colors of points' grounds
+        """
+
+        labels = self.labels
+        with self.stage('rgb_array', pixels=labels.size):
+            return self.palette[labels]
+
+    @cached_property
+    def image(self):
+        """
+        Image of a visualized pixels, with palette of grounds' colors
+        if there are not too many grounds
+        """
+
+        labels = self.labels
+        with self.stage('image', pixels=labels.size):
+            return palette_image(labels, self.palette)
+
+    def stage(self, name, **counts):
+        """
+        Method that measures stage of Tile Map if stats are collected
+
+        :param name: Name of stage
+        :type name: str
+        :param counts: Amounts of items processed in stage
+        :returns: Context manager giving dictionary of counts
+        """
+
+        if self.stats is None:
+            return nullcontext(counts)
+        return StageMeasurement(self.stats, name, counts)
+
+    def colors_to_use(self):
+        """
+        Method that checks colors of grounds used to construct Tile Map
+
+        :returns: List of RGB tuples of grounds' colors used in Tile Map
+        :rtype: list
+        """
+
+        colors = []
+        if self.grounds:
+            for item in self.grounds:
+                colors.append(TileMap.rgb_of_grounds[item])
+        if self.own_grounds:
+            for item in self.own_grounds.values():
+                colors.append(item)
+        return colors if colors else [TileMap.rgb_of_grounds['water'], TileMap.rgb_of_grounds['land']]
+
+    def central_pts_to_array(self, zeros_array, chosen_pts):
+        """
+        Method that applies central points to zeros array
+
+        :param zeros_array: NumPy array full of zeros with dimensions same as
+        dimensions of Map
+        :type zeros_array: numpy.ndarray
+        :param chosen_pts: Central points with its grounds
+        :type chosen_pts: dict
+        :returns: Modified zeros array with indexes of colors of
+        central points increased by one
+        :rtype: numpy.ndarray
+        """
+
+        colors = self.colors_to_use()
+        indexes = {color: colors.index(color) for color in colors}
+        for (x, y), ground in chosen_pts.items():
+            zeros_array[x, y] = indexes[ground] + 1
+        return zeros_array
+
+    @staticmethod
+    def amount_central_pts(width, height, grounds, own_grounds, min_pts=None, max_pts=None, rng=None):
         """
         Staticmethod that randomly chooses amount of central points
         in particular Tile Map. If User do not determine both
@@ -200,149 +597,126 @@ class TileMap:
         It will eliminate cases where Map would look unrealistic
         """
 
+        rng = np.random.default_rng(rng)
         if min(width, height) % 2 == 0:
-            l_lim = min(width, height)/2
-            h_lim = max(width, height)/2
+            l_lim = min(width, height)//2
+            h_lim = max(width, height)//2
         else:
-            l_lim = (min(width, height)-1)/2
-            h_lim = (max(width, height)-1)/2
+            l_lim = (min(width, height)-1)//2
+            h_lim = (max(width, height)-1)//2
         if min_pts and max_pts:
-            return randint(min_pts, max_pts)
+            low, high = min_pts, max_pts
         elif min_pts and not max_pts:
-            return randint(min_pts, max((h_lim, (len(grounds) + len(own_grounds)))))
+            low, high = min_pts, max((h_lim, (len(grounds) + len(own_grounds))))
         elif max_pts and not min_pts:
-            return randint(max(l_lim, (len(grounds) + len(own_grounds))), max_pts)
+            low, high = max(l_lim, (len(grounds) + len(own_grounds))), max_pts
         else:
-            return randint(l_lim, h_lim)
+            low, high = l_lim, h_lim
+        return int(rng.integers(low, high, endpoint=True))
 
-    def measure_distances(self, ls_central_pts):
+    def measure_distances(self, central_pts_array, counts=None):
         """
-        Method that measures distances for every zero in list with
-        central points, from zero to every central point and
-        chooses minimal distance
-
-        :param ls_central_pts: List with central points and zeros
-        :type ls_central_pts: list
-        :returns: List with only RGB tuples
-        :rtype: list
+        Method that finds the nearest central point for every zero in array
+        with central points. Distances are compared for whole blocks
+        of points at once and if few central points are equally distant,
+        one of them is chosen randomly. Indexes of the nearest central
+        points are kept as 'regions', so they are not searched again
+
+        :param central_pts_array: Array with central points and zeros
+        :type central_pts_array: numpy.ndarray
+        :param counts: Dictionary where amount of broken ties is added
+        to key 'ties', if provided
+        :type counts: dict
+        :returns: Array with index of color of every point
+        :rtype: numpy.ndarray
         """
 
-        for zero in range(len(self.every_zero[0])):
-            # Makes dictionary of distances from particular zero
-            # to every central point, and grounds corresponding to them
-            zero_distances = dict()
-            for point in self.chosen_pts.keys():
-                # Measures distances between particular zero in list
-                # and every central point
-                dist = sqrt(((self.cords_of_zeros[0, zero]-point[0])**2) + ((self.cords_of_zeros[1, zero]-point[1])**2))
-                zero_distances[point] = dist
-            minimal_dist = min(zero_distances.values())
-            rgb_list = self.apply_ground(zero_distances, minimal_dist, ls_central_pts, zero)
-        return rgb_list
-
-    def apply_ground(self, distances, min_dist, ls_central_pts, zero):
-        """
-        Method that changes elements in list with central points
-        from zero to RGB tuples of grounds
-
-        :param distances: Dictionary of distances from particular zero
-        to every central point
-        :type distances: dict
-        :param min_dist: Minimal distance to central point(s)
-        :type min_dist: float
-        :param ls_central_pts: List with central points and zeros
-        :type ls_central_pts: list
-        :param zero: Particular zero from where distances are measured
-        :type zero: int
-        :returns: List with RGB tuple in place of particular zero
-        :rtype: list
-        """
-
-        # List of element(s) with smallest distance(s) to zero
-        cords = [elem for elem in TileMap.get_keys(distances, min_dist)]
-        if len(cords) > 1:
-            # Chooses random ground from grounds of same distances to that zero
-            chosen_ground = choice(cords)
-            ls_central_pts[self.cords_of_zeros[0, zero]][self.cords_of_zeros[1, zero]] = self.chosen_pts[chosen_ground]
+        central_x, central_y = np.nonzero(central_pts_array)
+        grounds = (central_pts_array[central_x, central_y] - 1).astype(labels_dtype(len(self.palette)))
+        if self.processes and self.assignment != 'jump_flood':
+            nearest = assign_shared(central_x, central_y, self.height, self.width, self.salt,
+                                    self.assignment, self.processes, counts)
         else:
-            ls_central_pts[self.cords_of_zeros[0, zero]][self.cords_of_zeros[1, zero]] = self.chosen_pts[cords[0]]
-        return ls_central_pts
-
-    @staticmethod
-    def get_keys(dictionary, val):
-        """
-        Staticmethod that gets key(s) of items with given values in dictionary
+            nearest = assign_map(central_x, central_y, self.height, self.width, self.salt,
+                                 self.assignment, counts, self.workers)
+        self.region_pts = list(zip(central_x.tolist(), central_y.tolist()))
+        self.regions = nearest.astype(np.int32, copy=False)
+        return grounds[nearest]
 
-        :param dictionary: Dictionary to search in
-        :type dictionary: dict
-        :param val: Value of searched items
-        :type val: tuple
+    def expand_image(self, scale=16):
         """
-
-        keys = []
-        for key, value in dictionary.items():
-            if val == value:
-                keys.append(key)
-        return keys
-
-    def expand_image(self):
-        """
-        Method that expands image object 16 times to make every pixel
+        Method that expands image object 'scale' times to make every pixel
         bigger and better visible
 
+        :param scale: Length of side of a square made from every pixel
+        :type scale: int
         :returns: Expanded image object
         :rtype: PIL.Image.Image
         """
 
-        im_w, im_h = self.width, self.height
-        expanded_image = Image.new("RGB", (im_w * 16, im_h * 16))
-        for p_col in range(im_w):
-            for p_row in range(im_h):
-                color = self.image.getpixel((p_col, p_row))
-                for x in range(16):
-                    for y in range(16):
-                        expanded_image.putpixel((p_col * 16 + x, p_row * 16 + y), color)
-        return expanded_image
+        labels = self.labels
+        with self.stage('expand_image', pixels=labels.size * scale**2):
+            return palette_image(expand_array(labels, scale), self.palette)
 
-    def img_with_grid(self):
+    def img_with_grid(self, scale=16):
         """
         Method that draw grid on expanded image so that
         every pixel is highlighted
 
+        :param scale: Length of side of a square made from every pixel
+        :type scale: int
         :returns: Image object with a black grid
         :rtype: PIL.Image.Image
         """
 
-        image = self.expand_image()
-        draw = ImageDraw.Draw(image)
-        x_start, x_end = 0, image.width
-        y_start, y_end = 0, image.height
-        width_step_size = int(image.width / self.width)
-        height_step_size = int(image.height / self.height)
-
-        for x in range(0, image.width, width_step_size):
-            line = ((x, y_start), (x, y_end))
-            draw.line(line, fill=(0, 0, 0))
-        for y in range(0, image.height,  height_step_size):
-            line = ((x_start, y), (x_end, y))
-            draw.line(line, fill=(0, 0, 0))
-        return image
+        labels = self.labels
+        with self.stage('img_with_grid', pixels=labels.size * scale**2):
+            palette, black = add_black(self.palette)
+            expanded = expand_array(labels.astype(labels_dtype(len(palette)), copy=False), scale)
+            expanded[::scale, :] = black
+            expanded[:, ::scale] = black
+            return palette_image(expanded, palette)
 
-    def visualize(self):
+    def visualize(self, scale=16):
         """
         Method that visualizes constructed Tile Map
         """
 
-        self.img_with_grid().show()
+        self.img_with_grid(scale).show()
 
-    def save(self, path):
+    def save(self, path, scale=16):
         """
-        Method that saves constructed Tile Map in provided file
+        Method that saves constructed Tile Map in provided file.
+        PNG files are written row after row without making the whole
+        expanded image, so memory does not depend on height of image
         """
-        try:
-            self.img_with_grid().save(path)
-        except ValueError:
-            print(f"Unknown file extension")
+        if str(path).lower().endswith('.png'):
+            labels = self.labels
+            with self.stage('save', pixels=labels.size * scale**2):
+                write_png(path, labels, self.palette, scale)
+            return
+        image = self.img_with_grid(scale)
+        with self.stage('save', pixels=image.width * image.height):
+            try:
+                image.save(path)
+            except ValueError:
+                print(f"Unknown file extension")
+            except OSError:
+                # Format of file does not support images with palette
+                image.convert('RGB').save(path)
+
+    def export_pyramid(self, directory, tile_size=256):
+        """
+        Method that saves constructed Tile Map as pyramid of PNG tiles,
+        from the whole Map at the highest zoom to one tile at zoom 0
+
+        :returns: Amount of levels and amount of saved tiles
+        :rtype: tuple
+        """
+
+        labels = self.labels
+        with self.stage('export_pyramid', pixels=labels.size):
+            return export_pyramid(labels, self.palette, directory, tile_size)
 
 
 def load(path):
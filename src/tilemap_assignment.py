@@ -0,0 +1,695 @@
+from tilemap_exceptions import InvalidData
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil, sqrt
+
+
+# Upper limit of elements in one block of distances (pixels x central points)
+BLOCK_SIZE = 1 << 20
+# Minimal amount of central points for which grid of buckets is used
+GRID_MIN_CENTRAL_PTS = 48
+# Amount of bands of rows given to every thread
+BANDS_PER_WORKER = 4
+
+
+def tie_keys(pixel_keys, central_keys, salt):
+    """
+    Function that computes pseudo-random keys used to break ties
+    between central points equally distant from a pixel
+
+    Keys depend only on the pixel, the central point and the salt,
+    so ties are broken in the same way no matter in which order
+    or in which blocks pixels are processed
+
+    :param pixel_keys: Flat indexes of pixels
+    :type pixel_keys: numpy.ndarray
+    :param central_keys: Flat indexes of central points
+    :type central_keys: numpy.ndarray
+    :param salt: Number that changes the outcome of tie-breaking
+    :type salt: int
+    :returns: Array of keys with shape (pixels, central points)
+    :rtype: numpy.ndarray
+    """
+
+    return mix_keys(np.asarray(pixel_keys)[:, None], np.asarray(central_keys)[None, :], salt)
+
+
+def mix_keys(pixel_keys, central_keys, salt):
+    """
+    Function that computes keys used to break ties for pairs of pixels
+    and central points, broadcasting provided arrays against each other
+
+    :param pixel_keys: Flat indexes of pixels
+    :type pixel_keys: numpy.ndarray
+    :param central_keys: Flat indexes of central points
+    :type central_keys: numpy.ndarray
+    :param salt: Number that changes the outcome of tie-breaking
+    :type salt: int
+    :returns: Array of keys
+    :rtype: numpy.ndarray
+    """
+
+    pixels = np.asarray(pixel_keys).astype(np.uint64)
+    centrals = np.asarray(central_keys).astype(np.uint64)
+    keys = (pixels * np.uint64(0x9E3779B97F4A7C15)) ^ (centrals + np.uint64(salt))
+    # SplitMix64 finalizer
+    keys ^= keys >> np.uint64(30)
+    keys *= np.uint64(0xBF58476D1CE4E5B9)
+    keys ^= keys >> np.uint64(27)
+    keys *= np.uint64(0x94D049BB133111EB)
+    keys ^= keys >> np.uint64(31)
+    return keys
+
+
+def pick_nearest(distances, pixel_keys, central_keys, salt):
+    """
+    Function that chooses the nearest central point for every pixel,
+    randomly choosing one of central points with the same minimal distance
+
+    :param distances: Squared distances with shape (pixels, central points)
+    :type distances: numpy.ndarray
+    :param pixel_keys: Flat indexes of pixels
+    :type pixel_keys: numpy.ndarray
+    :param central_keys: Flat indexes of central points
+    :type central_keys: numpy.ndarray
+    :param salt: Number that changes the outcome of tie-breaking
+    :type salt: int
+    :returns: Indexes of chosen central points and mask of pixels
+    where a tie was broken
+    :rtype: tuple
+    """
+
+    nearest = distances.argmin(axis=1)
+    minimal = distances[np.arange(len(distances)), nearest]
+    tied = distances == minimal[:, None]
+    ties = np.count_nonzero(tied, axis=1) > 1
+    if ties.any():
+        rows = np.flatnonzero(ties)
+        keys = tie_keys(pixel_keys[rows], central_keys, salt)
+        keys[~tied[rows]] = 0
+        nearest[rows] = keys.argmax(axis=1)
+    return nearest, ties
+
+
+def nearest_central_pts(pts_x, pts_y, central_x, central_y, width, salt, return_ties=False):
+    """
+    Function that finds index of the nearest central point for every
+    provided pixel, processing pixels in blocks of limited size
+
+    :param pts_x: X-coordinates (rows) of pixels
+    :type pts_x: numpy.ndarray
+    :param pts_y: Y-coordinates (columns) of pixels
+    :type pts_y: numpy.ndarray
+    :param central_x: X-coordinates of central points
+    :type central_x: numpy.ndarray
+    :param central_y: Y-coordinates of central points
+    :type central_y: numpy.ndarray
+    :param width: Width of a Map, used to compute flat indexes
+    :type width: int
+    :param salt: Number that changes the outcome of tie-breaking
+    :type salt: int
+    :param return_ties: If mask of pixels where a tie was broken
+    should be returned too
+    :type return_ties: bool
+    :returns: Indexes of the nearest central points
+    :rtype: numpy.ndarray
+    """
+
+    pts_x = np.asarray(pts_x, dtype=np.int64)
+    pts_y = np.asarray(pts_y, dtype=np.int64)
+    central_x = np.asarray(central_x, dtype=np.int64)
+    central_y = np.asarray(central_y, dtype=np.int64)
+    central_keys = central_x * width + central_y
+    nearest = np.empty(len(pts_x), dtype=np.intp)
+    ties = np.empty(len(pts_x), dtype=bool)
+    step = max(1, BLOCK_SIZE // max(1, len(central_x)))
+    for start in range(0, len(pts_x), step):
+        block_x = pts_x[start:start + step]
+        block_y = pts_y[start:start + step]
+        distances = (block_x[:, None] - central_x[None, :]) ** 2
+        distances += (block_y[:, None] - central_y[None, :]) ** 2
+        nearest[start:start + step], ties[start:start + step] = pick_nearest(
+            distances, block_x * width + block_y, central_keys, salt)
+    return (nearest, ties) if return_ties else nearest
+
+
+def assign_window(central_x, central_y, width, salt, x_start, x_end, y_start, y_end, counts=None):
+    """
+    Function that finds index of the nearest central point for every
+    pixel in rectangular window of a Map
+
+    Squared distance is a sum of distance along rows and distance along
+    columns, so both parts are computed once per window and only added
+    together for every block of rows
+
+    :param central_x: X-coordinates of central points
+    :type central_x: numpy.ndarray
+    :param central_y: Y-coordinates of central points
+    :type central_y: numpy.ndarray
+    :param width: Width of a Map, used to compute flat indexes
+    :type width: int
+    :param salt: Number that changes the outcome of tie-breaking
+    :type salt: int
+    :param x_start: First row of window
+    :type x_start: int
+    :param x_end: Row after last row of window
+    :type x_end: int
+    :param y_start: First column of window
+    :type y_start: int
+    :param y_end: Column after last column of window
+    :type y_end: int
+    :param counts: Dictionary where amount of broken ties is added
+    to key 'ties', if provided
+    :type counts: dict
+    :returns: Two dimensional array with indexes of the nearest central points
+    :rtype: numpy.ndarray
+    """
+
+    central_x = np.asarray(central_x, dtype=np.int64)
+    central_y = np.asarray(central_y, dtype=np.int64)
+    central_keys = central_x * width + central_y
+    rows = np.arange(x_start, x_end, dtype=np.int64)
+    cols = np.arange(y_start, y_end, dtype=np.int64)
+    rows_dist = (rows[:, None] - central_x[None, :]) ** 2
+    cols_dist = (cols[:, None] - central_y[None, :]) ** 2
+    window = np.empty((len(rows), len(cols)), dtype=np.intp)
+    step = max(1, BLOCK_SIZE // max(1, len(cols) * len(central_x)))
+    for start in range(0, len(rows), step):
+        block = slice(start, start + step)
+        distances = rows_dist[block, None, :] + cols_dist[None, :, :]
+        n_rows = distances.shape[0]
+        distances = distances.reshape(n_rows * len(cols), len(central_x))
+        pixel_keys = (rows[block, None] * width + cols[None, :]).ravel()
+        nearest, ties = pick_nearest(distances, pixel_keys, central_keys, salt)
+        if counts is not None:
+            counts['ties'] = counts.get('ties', 0) + int(np.count_nonzero(ties))
+        window[block] = nearest.reshape(n_rows, len(cols))
+    return window
+
+
+def farthest_distances(central_x, central_y, x_start, x_end, y_start, y_end):
+    """
+    Function that measures squared distance from every central point
+    to the farthest pixel of rectangular window of a Map
+
+    :rtype: numpy.ndarray
+    """
+
+    far_x = np.maximum(np.abs(central_x - x_start), np.abs(central_x - (x_end - 1)))
+    far_y = np.maximum(np.abs(central_y - y_start), np.abs(central_y - (y_end - 1)))
+    return far_x**2 + far_y**2
+
+
+def nearest_distances(central_x, central_y, x_start, x_end, y_start, y_end):
+    """
+    Function that measures squared distance from every central point
+    to the nearest pixel of rectangular window of a Map
+
+    :rtype: numpy.ndarray
+    """
+
+    near_x = np.maximum(np.maximum(x_start - central_x, central_x - (x_end - 1)), 0)
+    near_y = np.maximum(np.maximum(y_start - central_y, central_y - (y_end - 1)), 0)
+    return near_x**2 + near_y**2
+
+
+def near_window(central_x, central_y, x_start, x_end, y_start, y_end):
+    """
+    Function that finds every central point which can be the nearest
+    central point of any pixel in rectangular window of a Map,
+    checking every central point
+
+    :returns: Indexes of central points
+    :rtype: numpy.ndarray
+    """
+
+    central_x = np.asarray(central_x, dtype=np.int64)
+    central_y = np.asarray(central_y, dtype=np.int64)
+    window = (x_start, x_end, y_start, y_end)
+    limit = farthest_distances(central_x, central_y, *window).min()
+    return np.flatnonzero(nearest_distances(central_x, central_y, *window) <= limit)
+
+
+def cell_bounds(x, y, central_x, central_y, height, width, amount=32):
+    """
+    Function that finds rectangular window of a Map containing every pixel
+    which is not farther from point (x, y) than from any of provided
+    central points. Rectangle of a Map is cut by bisectors between
+    the point and its nearest central points, every other central point
+    could only make the area smaller
+
+    :param x: X-coordinate of point
+    :type x: int
+    :param y: Y-coordinate of point
+    :type y: int
+    :param central_x: X-coordinates of other central points
+    :type central_x: numpy.ndarray
+    :param central_y: Y-coordinates of other central points
+    :type central_y: numpy.ndarray
+    :param amount: Amount of the nearest central points used to cut the area
+    :type amount: int
+    :returns: Window as tuple (x_start, x_end, y_start, y_end)
+    :rtype: tuple
+    """
+
+    central_x = np.asarray(central_x, dtype=np.int64)
+    central_y = np.asarray(central_y, dtype=np.int64)
+    distances = (central_x - x)**2 + (central_y - y)**2
+    if len(distances) > amount:
+        nearest = np.argpartition(distances, amount)[:amount]
+    else:
+        nearest = np.arange(len(distances))
+    polygon = [(0, 0), (height - 1, 0), (height - 1, width - 1), (0, width - 1)]
+    for other_x, other_y in zip(central_x[nearest].tolist(), central_y[nearest].tolist()):
+        # Points (a, b) not farther from (x, y) than from other point
+        # satisfy: a * normal_x + b * normal_y <= limit
+        normal_x, normal_y = 2 * (other_x - x), 2 * (other_y - y)
+        limit = other_x**2 + other_y**2 - x**2 - y**2
+        polygon = clip_polygon(polygon, normal_x, normal_y, limit)
+    xs = [point[0] for point in polygon]
+    ys = [point[1] for point in polygon]
+    return (max(0, int(np.floor(min(xs) - 1e-9))), min(height, int(np.ceil(max(xs) + 1e-9)) + 1),
+            max(0, int(np.floor(min(ys) - 1e-9))), min(width, int(np.ceil(max(ys) + 1e-9)) + 1))
+
+
+def clip_polygon(polygon, normal_x, normal_y, limit):
+    """
+    Function that cuts convex polygon by half-plane
+    a * normal_x + b * normal_y <= limit
+
+    :param polygon: List of vertices
+    :type polygon: list
+    :returns: List of vertices of part of polygon in half-plane
+    :rtype: list
+    """
+
+    clipped = []
+    for index, (a, b) in enumerate(polygon):
+        next_a, next_b = polygon[(index + 1) % len(polygon)]
+        value = a * normal_x + b * normal_y - limit
+        next_value = next_a * normal_x + next_b * normal_y - limit
+        if value <= 0:
+            clipped.append((a, b))
+        if (value < 0 < next_value) or (next_value < 0 < value):
+            ratio = value / (value - next_value)
+            clipped.append((a + ratio * (next_a - a), b + ratio * (next_b - b)))
+    return clipped
+
+
+class CentralPtsGrid:
+    """
+    A Class used to find central points near a part of a Map
+
+    Central points are put into square buckets of a uniform grid,
+    so only buckets close to a window of a Map have to be searched
+    """
+
+    def __init__(self, central_x, central_y, height, width, bucket_size=None):
+        """
+        Initiates an CentralPtsGrid object
+
+        :param central_x: X-coordinates of central points
+        :type central_x: numpy.ndarray
+        :param central_y: Y-coordinates of central points
+        :type central_y: numpy.ndarray
+        :param height: Height of a Map
+        :type height: int
+        :param width: Width of a Map
+        :type width: int
+        :param bucket_size: Length of side of a bucket, by default chosen
+        so that there is about one central point in every bucket
+        :type bucket_size: int
+        """
+
+        self.central_x = np.asarray(central_x, dtype=np.int64)
+        self.central_y = np.asarray(central_y, dtype=np.int64)
+        if not len(self.central_x):
+            raise InvalidData(f"Map needs at least one central point")
+        self.height = height
+        self.width = width
+        if not bucket_size:
+            bucket_size = max(1, int(sqrt(height * width / max(1, len(self.central_x)))))
+        self.bucket_size = bucket_size
+        self.buckets_x = ceil(height / bucket_size)
+        self.buckets_y = ceil(width / bucket_size)
+        buckets = (self.central_x // bucket_size) * self.buckets_y + self.central_y // bucket_size
+        # Central points sorted by bucket, points of bucket 'b' are
+        # self.order[self.starts[b]:self.starts[b + 1]]
+        self.order = np.argsort(buckets, kind='stable')
+        counts = np.bincount(buckets, minlength=self.buckets_x * self.buckets_y)
+        self.starts = np.concatenate(([0], np.cumsum(counts)))
+
+    def points_in_buckets(self, x_start, x_end, y_start, y_end):
+        """
+        Method that gets indexes of central points in rectangle of buckets
+
+        :returns: Indexes of central points from buckets in rows
+        [x_start, x_end] and columns [y_start, y_end]
+        :rtype: numpy.ndarray
+        """
+
+        x_start, y_start = max(x_start, 0), max(y_start, 0)
+        x_end, y_end = min(x_end, self.buckets_x - 1), min(y_end, self.buckets_y - 1)
+        parts = []
+        for bucket_x in range(x_start, x_end + 1):
+            first = bucket_x * self.buckets_y
+            parts.append(self.order[self.starts[first + y_start]:self.starts[first + y_end + 1]])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def query(self, x_start, x_end, y_start, y_end):
+        """
+        Method that finds every central point which can be the nearest
+        central point of any pixel in rectangular window of a Map
+
+        At first buckets around the window are searched until any
+        central point is found. The farthest distance from the window
+        to the closest of them limits how far the nearest central points
+        can be, so every central point within that distance is returned,
+        including central points with equal distances
+
+        :returns: Indexes of central points
+        :rtype: numpy.ndarray
+        """
+
+        size = self.bucket_size
+        first_x, last_x = x_start // size, (x_end - 1) // size
+        first_y, last_y = y_start // size, (y_end - 1) // size
+        ring = 0
+        found = self.points_in_buckets(first_x, last_x, first_y, last_y)
+        while not len(found):
+            ring += 1
+            found = self.points_in_buckets(first_x - ring, last_x + ring, first_y - ring, last_y + ring)
+        window = (x_start, x_end, y_start, y_end)
+        limit = farthest_distances(self.central_x[found], self.central_y[found], *window).min()
+        radius = int(ceil(sqrt(limit)))
+        candidates = self.points_in_buckets(
+            (x_start - radius) // size, (x_end - 1 + radius) // size,
+            (y_start - radius) // size, (y_end - 1 + radius) // size)
+        near = nearest_distances(self.central_x[candidates], self.central_y[candidates], *window)
+        return np.sort(candidates[near <= limit])
+
+    def assign_window(self, salt, x_start, x_end, y_start, y_end, tile_size=None, counts=None):
+        """
+        Method that finds index of the nearest central point for every
+        pixel in rectangular window of a Map, checking only central points
+        close to every tile of the window
+
+        :param salt: Number that changes the outcome of tie-breaking
+        :type salt: int
+        :param tile_size: Length of side of a tile, by default
+        two lengths of bucket's side
+        :type tile_size: int
+        :param counts: Dictionary where amount of broken ties is added
+        to key 'ties', if provided
+        :type counts: dict
+        :returns: Two dimensional array with indexes of the nearest central points
+        :rtype: numpy.ndarray
+        """
+
+        tile_size = tile_size if tile_size else max(16, 2 * self.bucket_size)
+        window = np.empty((x_end - x_start, y_end - y_start), dtype=np.intp)
+        for tile_x in range(x_start, x_end, tile_size):
+            tile_x_end = min(tile_x + tile_size, x_end)
+            for tile_y in range(y_start, y_end, tile_size):
+                tile_y_end = min(tile_y + tile_size, y_end)
+                candidates = self.query(tile_x, tile_x_end, tile_y, tile_y_end)
+                nearest = assign_window(
+                    self.central_x[candidates], self.central_y[candidates], self.width, salt,
+                    tile_x, tile_x_end, tile_y, tile_y_end, counts)
+                window[tile_x - x_start:tile_x_end - x_start, tile_y - y_start:tile_y_end - y_start] = candidates[nearest]
+        return window
+
+    def nearest_pts(self, salt, pts_x, pts_y, tile_size=None):
+        """
+        Method that finds index of the nearest central point for every
+        provided pixel, checking only central points close to the tile
+        of the Map containing the pixel
+
+        :param salt: Number that changes the outcome of tie-breaking
+        :type salt: int
+        :param pts_x: X-coordinates (rows) of pixels
+        :type pts_x: numpy.ndarray
+        :param pts_y: Y-coordinates (columns) of pixels
+        :type pts_y: numpy.ndarray
+        :param tile_size: Length of side of a tile, by default
+        two lengths of bucket's side
+        :type tile_size: int
+        :returns: Indexes of the nearest central points and mask
+        of pixels where a tie was broken
+        :rtype: tuple
+        """
+
+        tile_size = tile_size if tile_size else max(16, 2 * self.bucket_size)
+        pts_x = np.asarray(pts_x, dtype=np.int64)
+        pts_y = np.asarray(pts_y, dtype=np.int64)
+        nearest = np.empty(len(pts_x), dtype=np.intp)
+        ties = np.empty(len(pts_x), dtype=bool)
+        tiles_y = ceil(self.width / tile_size)
+        tiles = (pts_x // tile_size) * tiles_y + pts_y // tile_size
+        order = np.argsort(tiles, kind='stable')
+        bounds = np.flatnonzero(np.diff(tiles[order])) + 1
+        for part in np.split(order, bounds) if len(order) else []:
+            tile_x, tile_y = divmod(int(tiles[part[0]]), tiles_y)
+            x_start, y_start = tile_x * tile_size, tile_y * tile_size
+            candidates = self.query(x_start, min(x_start + tile_size, self.height),
+                                    y_start, min(y_start + tile_size, self.width))
+            found, tied = nearest_central_pts(pts_x[part], pts_y[part], self.central_x[candidates],
+                                              self.central_y[candidates], self.width, salt, True)
+            nearest[part], ties[part] = candidates[found], tied
+        return nearest, ties
+
+
+def jump_flood(central_x, central_y, height, width, salt):
+    """
+    Function that approximately finds index of the nearest central point
+    for every pixel of a Map with Jump Flooding Algorithm
+
+    Every central point is written into its own pixel, then in passes
+    with steps halved from half of size of a Map down to one, every pixel
+    takes the nearest of central points known by itself and by eight pixels
+    distant by the step. Two additional passes with steps two and one
+    fix most of remaining mistakes. Cost of every pass is proportional to
+    amount of pixels, there are about log2(max(width, height)) + 2 passes
+    and it does not depend on amount of central points.
+
+    Result is not always exact. Mistakes can appear only next to borders
+    of areas of central points, where information about the nearest
+    central point was overwritten by a farther one. There is no fixed
+    bound of such mistakes. In tests of maps with uniformly random central
+    points less than 0.5% of pixels got other central point than in exact
+    assignment and they were less than one pixel farther from it than from
+    the nearest one. In maps with tight clusters of central points about
+    2% of pixels were wrong, up to three pixels farther.
+
+    Every pass makes a few arrays of the size of a Map for every one
+    of eight neighbours, so it is not faster than 'grid' assignment
+    even for many central points. It is kept for comparison.
+
+    :returns: Two dimensional array with indexes of central points
+    :rtype: numpy.ndarray
+    """
+
+    # Distances fit in 32 bits in maps with sides up to about ten thousand
+    dtype = np.int32 if 18 * max(height, width)**2 < 2**31 else np.int64
+    # Index -1 of pixels without central point points to an additional
+    # central point farther than every real one, so no mask is needed
+    far = 2 * max(height, width)
+    central_x = np.append(np.asarray(central_x, dtype=dtype), far)
+    central_y = np.append(np.asarray(central_y, dtype=dtype), far)
+    central_keys = central_x.astype(np.int64) * width + central_y
+    rows = np.arange(height, dtype=dtype)[:, None]
+    cols = np.arange(width, dtype=dtype)[None, :]
+    nearest = np.full((height, width), -1, dtype=np.intp)
+    nearest[central_x[:-1], central_y[:-1]] = np.arange(len(central_x) - 1)
+    distances = np.full((height, width), np.iinfo(dtype).max, dtype=dtype)
+    distances[central_x[:-1], central_y[:-1]] = 0
+    steps = []
+    step = 1
+    while step < max(height, width):
+        steps.insert(0, step)
+        step *= 2
+    for step in steps + [2, 1]:
+        previous = nearest.copy()
+        # Coordinates of central points known in previous pass
+        previous_x = central_x[previous]
+        previous_y = central_y[previous]
+        for dx in (-step, 0, step):
+            for dy in (-step, 0, step):
+                if (dx == 0 and dy == 0) or abs(dx) >= height or abs(dy) >= width:
+                    continue
+                # Window of pixels and window of their neighbours at (dx, dy)
+                target = (slice(max(0, -dx), height - max(0, dx)), slice(max(0, -dy), width - max(0, dy)))
+                source = (slice(max(0, dx), height + min(0, dx)), slice(max(0, dy), width + min(0, dy)))
+                dist = np.square(rows[target[0]] - previous_x[source])
+                dist += np.square(cols[:, target[1]] - previous_y[source])
+                target_distances = distances[target]
+                better = dist < target_distances
+                tied = dist == target_distances
+                if tied.any():
+                    tied &= previous[source] != nearest[target]
+                    if tied.any():
+                        tied_x, tied_y = np.nonzero(tied)
+                        keys = (tied_x + target[0].start).astype(np.int64) * width + tied_y + target[1].start
+                        candidates = previous[source][tied]
+                        tied[tied] = mix_keys(keys, central_keys[candidates], salt) > \
+                            mix_keys(keys, central_keys[nearest[target][tied]], salt)
+                        better |= tied
+                np.copyto(nearest[target], previous[source], where=better)
+                np.copyto(target_distances, dist, where=better)
+    return nearest
+
+
+def choose_assignment(amount_central_pts):
+    """
+    Function that chooses method of finding the nearest central points.
+    Few central points are compared directly with every pixel, many
+    central points are searched through grid of buckets
+
+    :param amount_central_pts: Amount of central points
+    :type amount_central_pts: int
+    :returns: 'brute' or 'grid'
+    :rtype: str
+    """
+
+    return 'grid' if amount_central_pts >= GRID_MIN_CENTRAL_PTS else 'brute'
+
+
+def assign_bands(assign, height, width, workers, counts=None):
+    """
+    Function that splits a Map into bands of rows and assigns them
+    on pool of threads. NumPy releases GIL while computing distances,
+    so bands are computed at the same time. Every band is written into
+    its own rows of the result and ties are broken by coordinates,
+    so result does not depend on amount of threads
+
+    :param assign: Function called with first row, row after last row
+    and dictionary of counts, returning indexes of the nearest central
+    points for whole rows of a band
+    :type assign: function
+    :param workers: Amount of threads
+    :type workers: int
+    :returns: Two dimensional array with indexes of the nearest central points
+    :rtype: numpy.ndarray
+    """
+
+    nearest = np.empty((height, width), dtype=np.intp)
+    band = max(1, ceil(height / (BANDS_PER_WORKER * workers)))
+    bands = [(x_start, min(x_start + band, height)) for x_start in range(0, height, band)]
+    bands_counts = [dict() for _ in bands]
+
+    def fill(index):
+        x_start, x_end = bands[index]
+        nearest[x_start:x_end] = assign(x_start, x_end, bands_counts[index])
+
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(fill, range(len(bands))))
+    if counts is not None:
+        counts['ties'] = counts.get('ties', 0) + sum(band_counts.get('ties', 0) for band_counts in bands_counts)
+    return nearest
+
+
+def assign_map(central_x, central_y, height, width, salt, assignment=None, counts=None, workers=None):
+    """
+    Function that finds index of the nearest central point for every
+    pixel of a Map
+
+    :param assignment: Method of finding the nearest central points:
+    'brute', 'grid', 'jump_flood' (approximate, see function jump_flood)
+    or None to choose it by amount of central points
+    :type assignment: str
+    :param counts: Dictionary where amount of ties broken by exact
+    methods is added to key 'ties', if provided
+    :type counts: dict
+    :param workers: Amount of threads computing bands of rows of exact
+    methods, by default one; jump flooding always uses one thread
+    :type workers: int
+    :returns: Two dimensional array with indexes of the nearest central points
+    :rtype: numpy.ndarray
+    """
+
+    if not assignment:
+        assignment = choose_assignment(len(central_x))
+    if assignment == 'jump_flood':
+        return jump_flood(central_x, central_y, height, width, salt)
+    if assignment == 'grid':
+        grid = CentralPtsGrid(central_x, central_y, height, width)
+
+        def assign(x_start, x_end, counts):
+            return grid.assign_window(salt, x_start, x_end, 0, width, counts=counts)
+    else:
+        def assign(x_start, x_end, counts):
+            return assign_window(central_x, central_y, width, salt, x_start, x_end, 0, width, counts)
+    if workers and workers > 1:
+        return assign_bands(assign, height, width, workers, counts)
+    return assign(0, height, counts)
+
+
+def progressive_assign(central_x, central_y, height, width, salt, callback=None, factor=8, counts=None):
+    """
+    Function that finds index of the nearest central point for every
+    pixel of a Map in passes, from blocks of 'factor' x 'factor' pixels
+    down to single pixels
+
+    In every pass only corners of unresolved blocks are computed.
+    Area of every central point is convex, so if all four corners of
+    a block have the same nearest central point without a tie, so does
+    every pixel of the block. Other blocks are split into four blocks for
+    the next pass, so only blocks on borders of areas are computed again
+    and the final result is the same as the exact assignment.
+
+    :param callback: Function called after corners of every pass are
+    computed, with array of the nearest central points of top left pixels
+    of all blocks (Map in 1/size of its resolution) and size of blocks,
+    the last call gets the final result
+    :type callback: function
+    :param factor: Length of side of the first blocks, rounded down
+    to a power of two
+    :type factor: int
+    :param counts: Dictionary where amount of broken ties is added
+    to key 'ties', if provided
+    :type counts: dict
+    :returns: Two dimensional array with indexes of the nearest central points
+    :rtype: numpy.ndarray
+    """
+
+    grid = CentralPtsGrid(central_x, central_y, height, width)
+    size = 1 << (max(1, factor).bit_length() - 1)
+    active = np.ones((ceil(height / size), ceil(width / size)), dtype=bool)
+    # Map is extended to whole blocks, so blocks can be filled through a view
+    nearest = np.full((active.shape[0] * size, active.shape[1] * size), -1, dtype=np.intp)
+    tied = np.zeros(nearest.shape, dtype=bool)
+    while True:
+        # Corners of every block are its first row and column and the first
+        # row and column of the next block, so blocks share their corners
+        first_x = np.arange(0, height, size)
+        last_x = np.minimum(first_x + size, height - 1)
+        first_y = np.arange(0, width, size)
+        last_y = np.minimum(first_y + size, width - 1)
+        blocks_x, blocks_y = np.nonzero(active)
+        corners_x = np.concatenate([first_x[blocks_x], first_x[blocks_x], last_x[blocks_x], last_x[blocks_x]])
+        corners_y = np.concatenate([first_y[blocks_y], last_y[blocks_y], first_y[blocks_y], last_y[blocks_y]])
+        unknown = nearest[corners_x, corners_y] < 0
+        keys = np.unique(corners_x[unknown] * width + corners_y[unknown])
+        nearest[keys // width, keys % width], tied[keys // width, keys % width] = \
+            grid.nearest_pts(salt, keys // width, keys % width)
+        if size == 1:
+            nearest = nearest[:height, :width]
+            if counts is not None:
+                counts['ties'] = counts.get('ties', 0) + int(np.count_nonzero(tied[:height, :width]))
+            if callback is not None:
+                callback(nearest, size)
+            return nearest
+        corners = [nearest[np.ix_(rows, cols)] for rows in (first_x, last_x) for cols in (first_y, last_y)]
+        if callback is not None:
+            callback(corners[0], size)
+        corners_tied = [tied[np.ix_(rows, cols)] for rows in (first_x, last_x) for cols in (first_y, last_y)]
+        uniform = active & (corners[0] == corners[1]) & (corners[0] == corners[2]) & (corners[0] == corners[3])
+        uniform &= ~(corners_tied[0] | corners_tied[1] | corners_tied[2] | corners_tied[3])
+        blocks = nearest.reshape(active.shape[0], size, active.shape[1], size).transpose(0, 2, 1, 3)
+        blocks[uniform] = corners[0][uniform][:, None, None]
+        active &= ~uniform
+        size //= 2
+        active = np.repeat(np.repeat(active, 2, axis=0), 2, axis=1)[:ceil(height / size), :ceil(width / size)]
+        # Blocks of the extended Map beyond its last row or column are dropped
+        nearest = nearest[:active.shape[0] * size, :active.shape[1] * size]
+        tied = tied[:active.shape[0] * size, :active.shape[1] * size]
@@ -0,0 +1,64 @@
+from tilemap import TileMap
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def generate_labels(spec):
+    """
+    Function that constructs Tile Map from provided specification
+    and returns only its compact parts
+
+    :param spec: Dictionary of arguments of TileMap class
+    :type spec: dict
+    :returns: NumPy array with indexes of colors and palette
+    :rtype: tuple
+    """
+
+    tmap = TileMap(**spec)
+    return tmap.labels, tmap.palette
+
+
+def generate_many(specs, workers=None):
+    """
+    Generator that constructs many Tile Maps in pool of processes and
+    yields them in order in which they are finished. Only arrays with
+    indexes of colors and palettes are sent back from processes
+
+    :param specs: Dictionaries of arguments of TileMap class,
+    for example {'width': 20, 'height': 30, 'seed': 1}
+    :type specs: list
+    :param workers: Amount of processes, by default amount of CPUs.
+    With one worker Maps are constructed in current process
+    :type workers: int
+    :returns: Tuples with index of specification, NumPy array with indexes
+    of colors and palette
+    :rtype: generator
+    """
+
+    for index, (labels, palette) in run_many(generate_labels, specs, workers):
+        yield index, labels, palette
+
+
+def run_many(task, items, workers=None):
+    """
+    Generator that calls provided function for every item in pool
+    of processes and yields results in order in which they are finished
+
+    :param task: Function defined at top level of a module
+    :type task: function
+    :param items: Arguments of function
+    :type items: list
+    :param workers: Amount of processes, by default amount of CPUs.
+    With one worker function is called in current process
+    :type workers: int
+    :returns: Tuples with index of item and result of function
+    :rtype: generator
+    """
+
+    if workers == 1:
+        for index, item in enumerate(items):
+            yield index, task(item)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {executor.submit(task, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,128 @@
+from tilemap_batch import generate_labels
+from collections import OrderedDict
+from hashlib import sha256
+import numpy as np
+import json
+import os
+
+
+class MapCache:
+    """
+    A Class used to avoid constructing the same Tile Map again
+
+    Arrays with indexes of colors and palettes are kept in files named
+    after hash of normalized arguments of TileMap class and the most
+    recently used of them are also kept in memory. Only Tile Maps with
+    provided integer seed are cached, because only they can be constructed again.
+    """
+
+    def __init__(self, directory, max_bytes=2**30, memory_items=16):
+        """
+        Initiates an MapCache object
+
+        :param directory: Directory with files of cached Tile Maps
+        :type directory: str
+        :param max_bytes: Maximal size of files in directory, the least
+        recently used files are removed when it is exceeded
+        :type max_bytes: int
+        :param memory_items: Maximal amount of Tile Maps kept in memory
+        :type memory_items: int
+
+        :param hits: Amount of Tile Maps found in cache
+        :type hits: int
+        :param misses: Amount of Tile Maps that had to be constructed
+        :type misses: int
+        """
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(spec):
+        """
+        Staticmethod that computes hash of arguments of TileMap class,
+        equal for arguments that give identical Tile Maps
+
+        :param spec: Dictionary of arguments of TileMap class
+        :type spec: dict
+        :rtype: str
+        """
+
+        normalized = {
+            'width': spec['width'],
+            'height': spec['height'],
+            'grounds': spec.get('grounds') or ['water', 'land'],
+            'own_grounds': [[name, list(rgb)] for name, rgb in (spec.get('own_grounds') or {}).items()],
+            'min_pts': spec.get('min_pts') or None,
+            'max_pts': spec.get('max_pts') or None,
+            # Exact methods of assignment give identical Tile Maps
+            'jump_flood': spec.get('assignment') == 'jump_flood',
+            'seed': spec.get('seed'),
+        }
+        return sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+    def get(self, spec):
+        """
+        Method that gets Tile Map from cache or constructs it
+
+        :param spec: Dictionary of arguments of TileMap class
+        :type spec: dict
+        :returns: NumPy array with indexes of colors and palette
+        :rtype: tuple
+        """
+
+        # Maps without seed or made by provided generator cannot be made again
+        if type(spec.get('seed')) != int:
+            return generate_labels(spec)
+        key = MapCache.key(spec)
+        if key in self.memory:
+            self.hits += 1
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        path = os.path.join(self.directory, f'{key}.npz')
+        try:
+            with np.load(path) as data:
+                result = data['labels'], data['palette']
+            os.utime(path)
+            self.hits += 1
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            result = generate_labels(spec)
+            self.misses += 1
+            self.store(path, *result)
+        self.remember(key, result)
+        return result
+
+    def remember(self, key, result):
+        """
+        Method that keeps Tile Map in memory, forgetting
+        the least recently used one if there are too many
+        """
+
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    def store(self, path, labels, palette):
+        """
+        Method that writes Tile Map to file and removes the least
+        recently used files if they are too big
+        """
+
+        temporary = f'{path}.tmp.npz'
+        np.savez(temporary, labels=labels, palette=palette)
+        os.replace(temporary, path)
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.npz')]
+        files.sort(key=os.path.getmtime)
+        size = sum(os.path.getsize(name) for name in files)
+        # Just written file is never removed
+        files.remove(path)
+        while size > self.max_bytes and files:
+            oldest = files.pop(0)
+            size -= os.path.getsize(oldest)
+            os.remove(oldest)
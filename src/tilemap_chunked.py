@@ -0,0 +1,54 @@
+from tilemap import TileMap
+from tilemap_exceptions import (
+    verify_dimensions,
+    verify_pts,
+    verify_grounds,
+    )
+from tilemap_help_functions import choose_central_pts, labels_dtype
+from tilemap_assignment import CentralPtsGrid
+import numpy as np
+
+
+def generate_chunked(path, width, height, grounds=None, own_grounds=None, min_pts=None, max_pts=None, chunk_size=1024, seed=None):
+    """
+    Function that generates Tile Map too big to be kept in memory.
+    Central points are chosen for the whole Map, then grounds are assigned
+    to square chunks of the Map one after another and written to
+    '.npy' file mapped to memory, so only one chunk is kept in memory
+
+    :param path: Path of '.npy' file with indexes of grounds' colors
+    :type path: str
+    :param chunk_size: Length of side of a chunk
+    :type chunk_size: int
+    :param seed: Seed of generator of random numbers or generator itself,
+    with same seed Map is identical to Map made by TileMap class
+    :type seed: int or numpy.random.Generator
+    :returns: Array mapped to file with indexes of colors of grounds,
+    dictionary of central points with their grounds and list of colors
+    :rtype: tuple
+    """
+
+    verify_dimensions(width, height, grounds, own_grounds)
+    verify_grounds(width, height, grounds, own_grounds, min_pts, max_pts)
+    verify_pts(width, height, grounds or [], own_grounds or {}, min_pts, max_pts)
+    grounds = ['water', 'land'] if not grounds else grounds
+    own_grounds = dict() if not own_grounds else own_grounds
+    colors = [TileMap.rgb_of_grounds[ground] for ground in grounds] + list(own_grounds.values())
+    rng = np.random.default_rng(seed)
+    salt = int(rng.integers(2**32))
+    amount = TileMap.amount_central_pts(width, height, grounds, own_grounds, min_pts, max_pts, rng)
+    chosen_pts = choose_central_pts(height, width, amount, len(colors), rng)
+    central_x = np.array([point[0] for point in chosen_pts])
+    central_y = np.array([point[1] for point in chosen_pts])
+    central_grounds = np.array(list(chosen_pts.values()), dtype=labels_dtype(len(colors)))
+    labels = np.lib.format.open_memmap(path, mode='w+', dtype=central_grounds.dtype, shape=(height, width))
+    grid = CentralPtsGrid(central_x, central_y, height, width)
+    for x_start in range(0, height, chunk_size):
+        x_end = min(x_start + chunk_size, height)
+        for y_start in range(0, width, chunk_size):
+            y_end = min(y_start + chunk_size, width)
+            nearest = grid.assign_window(salt, x_start, x_end, y_start, y_end)
+            labels[x_start:x_end, y_start:y_end] = central_grounds[nearest]
+        labels.flush()
+    return labels, {point: colors[ground] for point, ground in chosen_pts.items()}, colors
+
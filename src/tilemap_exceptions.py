@@ -100,3 +100,46 @@ def verify_grounds(width, height, grounds=None, own_grounds=None, min_pts=None,
     if grounds and own_grounds:
         if (len(grounds) + len(own_grounds)) > (width*height):
             raise InvalidData(f"Amoint of grounds is too big")
+
+
+def verify_assignment(assignment=None):
+    """
+    Function that verify method of finding the nearest central points
+    chosen by User
+    """
+
+    if assignment and assignment not in {'brute', 'grid', 'jump_flood'}:
+        raise InvalidData(f"Method of assignment '{assignment}' is not available")
+
+
+def verify_workers(workers=None):
+    """
+    Function that verify amount of threads chosen by User
+    """
+
+    if workers is not None and (type(workers) != int or workers < 1):
+        raise InvalidData(f"Amount of workers should be a positive integer")
+
+
+def verify_central_pt(width, height, point, colors=None, ground=None):
+    """
+    Function that verify central point and its ground given by User
+    to be added to Tile Map
+    """
+
+    if type(point) != tuple or len(point) != 2 or any(type(cord) != int for cord in point):
+        raise InvalidData(f"Wrong given central point")
+    if not (0 <= point[0] < height and 0 <= point[1] < width):
+        raise InvalidData(f"Central point {point} is outside of the map")
+    if colors is not None and ground not in colors:
+        raise InvalidData(f"Ground {ground} is not used in the map")
+
+
+def verify_central_pts(chosen_pts):
+    """
+    Function that verify that central points of Tile Map are known,
+    they are not known in Map read from image
+    """
+
+    if not chosen_pts:
+        raise InvalidData(f"Central points of the map are unknown")
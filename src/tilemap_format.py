@@ -0,0 +1,204 @@
+from tilemap import TileMap
+from tilemap_exceptions import InvalidData
+import numpy as np
+import struct
+import json
+import zlib
+
+
+MAGIC = b'TMAP'
+VERSION = 1
+# Magic, version, length of JSON header and offset of labels
+PREFIX = struct.Struct('<4sHIQ')
+ALIGNMENT = 64
+
+
+def write_map(tmap, path, compression=None, chunk_size=256):
+    """
+    Function that saves Tile Map in native format: fixed prefix, JSON
+    header with dimensions, grounds, palette, central points and seed,
+    then indexes of colors of grounds. Without compression indexes are
+    saved row after row, so they can be mapped to memory. With 'zlib'
+    compression every square chunk is compressed separately and table
+    of offsets of chunks is saved before them
+
+    :param tmap: Tile Map to save
+    :type tmap: TileMap
+    :param path: Path of a file
+    :type path: str
+    :param compression: None or 'zlib'
+    :type compression: str
+    :param chunk_size: Length of side of a compressed chunk
+    :type chunk_size: int
+    """
+
+    if compression not in (None, 'zlib'):
+        raise InvalidData(f"Unknown compression: {compression}")
+    labels = tmap.labels
+    colors = tmap.colors_to_use()
+    header = {
+        'width': tmap.width,
+        'height': tmap.height,
+        'grounds': tmap.grounds,
+        'own_grounds': {name: list(rgb) for name, rgb in tmap.own_grounds.items()},
+        'palette': tmap.palette.tolist(),
+        'central_pts': [[x, y, colors.index(ground)] for (x, y), ground in tmap.chosen_pts.items()],
+        'min_pts': tmap.min_pts,
+        'max_pts': tmap.max_pts,
+        'assignment': tmap.assignment,
+        'seed': tmap.seed if isinstance(tmap.seed, int) else None,
+        'salt': tmap.salt,
+        'dtype': labels.dtype.str,
+        'compression': compression,
+        'chunk_size': chunk_size,
+    }
+    header = json.dumps(header).encode()
+    data_offset = -(-(PREFIX.size + len(header)) // ALIGNMENT) * ALIGNMENT
+    with open(path, 'wb') as handle:
+        handle.write(PREFIX.pack(MAGIC, VERSION, len(header), data_offset))
+        handle.write(header)
+        handle.write(bytes(data_offset - PREFIX.size - len(header)))
+        if compression is None:
+            for x_start in range(0, tmap.height, chunk_size):
+                handle.write(np.ascontiguousarray(labels[x_start:x_start + chunk_size]).tobytes())
+            return
+        chunks = [(x_start, y_start) for x_start in range(0, tmap.height, chunk_size)
+                  for y_start in range(0, tmap.width, chunk_size)]
+        offsets = np.zeros(len(chunks) + 1, dtype='<u8')
+        handle.write(offsets.tobytes())
+        for index, (x_start, y_start) in enumerate(chunks):
+            offsets[index] = handle.tell()
+            chunk = labels[x_start:x_start + chunk_size, y_start:y_start + chunk_size]
+            handle.write(zlib.compress(np.ascontiguousarray(chunk).tobytes()))
+        offsets[-1] = handle.tell()
+        handle.seek(data_offset)
+        handle.write(offsets.tobytes())
+
+
+class MapFile:
+    """
+    A Class used to read Tile Map saved in native format
+
+    Opening a file reads only its header, indexes of colors of grounds
+    are read only for requested regions.
+    """
+
+    def __init__(self, path):
+        """
+        Initiates an MapFile object
+
+        :param path: Path of a file
+        :type path: str
+        """
+
+        self.path = path
+        self.handle = open(path, 'rb')
+        try:
+            prefix = self.handle.read(PREFIX.size)
+            if len(prefix) != PREFIX.size or prefix[:4] != MAGIC:
+                raise InvalidData(f"File '{path}' is not a Tile Map")
+            _, version, header_size, self.data_offset = PREFIX.unpack(prefix)
+            if version != VERSION:
+                raise InvalidData(f"Unknown version of file: {version}")
+            self.header = json.loads(self.handle.read(header_size))
+        except Exception:
+            self.handle.close()
+            raise
+        self.width = self.header['width']
+        self.height = self.header['height']
+        self.palette = np.array(self.header['palette'], dtype=np.uint8)
+        self.dtype = np.dtype(self.header['dtype'])
+        self.chunk_size = self.header['chunk_size']
+        self.compression = self.header['compression']
+        self.chunk_cols = -(-self.width // self.chunk_size)
+        if self.compression is None:
+            self.labels = np.memmap(path, dtype=self.dtype, mode='r', offset=self.data_offset,
+                                    shape=(self.height, self.width))
+        else:
+            chunks = -(-self.height // self.chunk_size) * self.chunk_cols
+            self.offsets = np.memmap(path, dtype='<u8', mode='r', offset=self.data_offset, shape=(chunks + 1,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Method that closes file
+        """
+
+        self.handle.close()
+
+    def read_chunk(self, row, column):
+        """
+        Method that reads and decompresses one chunk
+
+        :returns: Two dimensional array with indexes of colors
+        :rtype: numpy.ndarray
+        """
+
+        index = row * self.chunk_cols + column
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        self.handle.seek(start)
+        chunk = np.frombuffer(zlib.decompress(self.handle.read(end - start)), dtype=self.dtype)
+        x_start, y_start = row * self.chunk_size, column * self.chunk_size
+        return chunk.reshape(min(self.chunk_size, self.height - x_start), min(self.chunk_size, self.width - y_start))
+
+    def read_region(self, x_start, x_end, y_start, y_end):
+        """
+        Method that reads indexes of colors of grounds in rows from
+        'x_start' to 'x_end' and columns from 'y_start' to 'y_end',
+        reading only chunks overlapping with this region
+
+        :returns: Two dimensional array with indexes of colors
+        :rtype: numpy.ndarray
+        """
+
+        if not (0 <= x_start <= x_end <= self.height and 0 <= y_start <= y_end <= self.width):
+            raise InvalidData(f"Region is outside of a Map")
+        if self.compression is None:
+            return np.array(self.labels[x_start:x_end, y_start:y_end])
+        region = np.empty((x_end - x_start, y_end - y_start), dtype=self.dtype)
+        size = self.chunk_size
+        for row in range(x_start // size, -(-x_end // size)):
+            for column in range(y_start // size, -(-y_end // size)):
+                chunk = self.read_chunk(row, column)
+                top, left = row * size, column * size
+                rows = slice(max(x_start, top), min(x_end, top + size))
+                cols = slice(max(y_start, left), min(y_end, left + size))
+                region[rows.start - x_start:rows.stop - x_start, cols.start - y_start:cols.stop - y_start] = \
+                    chunk[rows.start - top:rows.stop - top, cols.start - left:cols.stop - left]
+        return region
+
+
+def read_map(path, stats=None, workers=None):
+    """
+    Function that loads Tile Map saved in native format with its
+    central points, so it can be changed like generated Tile Map
+
+    :param path: Path of a file
+    :type path: str
+    :rtype: TileMap
+    """
+
+    with MapFile(path) as mapfile:
+        header = mapfile.header
+        tmap = TileMap.__new__(TileMap)
+        tmap.width, tmap.height = header['width'], header['height']
+        tmap.grounds = header['grounds']
+        tmap.own_grounds = {name: tuple(rgb) for name, rgb in header['own_grounds'].items()}
+        tmap.min_pts, tmap.max_pts = header['min_pts'], header['max_pts']
+        tmap.assignment = header['assignment']
+        tmap.stats = stats
+        tmap.workers = workers
+        tmap.processes = None
+        tmap.seed = header['seed']
+        tmap.rng = np.random.default_rng(tmap.seed)
+        tmap.salt = header['salt']
+        tmap.palette = mapfile.palette
+        colors = tmap.colors_to_use()
+        tmap.chosen_pts = {(x, y): colors[ground] for x, y, ground in header['central_pts']}
+        tmap.labels = mapfile.read_region(0, tmap.height, 0, tmap.width)
+    return tmap
@@ -1,5 +1,5 @@
 import numpy as np
-from random import randint
+from PIL import Image
 
 
 def convert_to_np(ls, dtype=None):
@@ -38,28 +38,214 @@ def stack_array(array1, array2):
     return np.vstack((array1, array2))
 
 
-def choose_random_coordinate(limit1, limit2):
+def choose_random_indexes(limit, amount, rng=None):
     """
-    Function that chooses two random values within provided range
+    Function that chooses provided amount of different random values
+    in range [0, limit) with Floyd's algorithm, drawing exactly one
+    random value for every chosen value
+
+    :param limit: High limit
+    :type limit: int
+    :param amount: Amount of values to choose
+    :type amount: int
+    :param rng: Generator of random numbers or its seed
+    :type rng: numpy.random.Generator
+    :returns: List of chosen values
+    :rtype: list
+    """
+
+    highs = np.arange(limit - amount, limit, dtype=np.int64)
+    values = np.random.default_rng(rng).integers(0, highs, endpoint=True)
+    chosen = dict()
+    for high, value in zip(highs.tolist(), values.tolist()):
+        chosen[high if value in chosen else value] = None
+    return list(chosen)
+
+
+def choose_central_pts(height, width, amount, amount_colors, rng=None):
+    """
+    Function that chooses random coordinates of central points
+    and indexes of their grounds, so that every ground
+    is used at least one time
+
+    :param height: Height of a Map
+    :type height: int
+    :param width: Width of a Map
+    :type width: int
+    :param amount: Amount of central points
+    :type amount: int
+    :param amount_colors: Amount of colors of grounds
+    :type amount_colors: int
+    :param rng: Generator of random numbers or its seed
+    :type rng: numpy.random.Generator
+    :returns: Dictionary of coordinates of central points
+    with indexes of their grounds
+    :rtype: dict
+    """
+
+    rng = np.random.default_rng(rng)
+    indexes = choose_random_indexes(height * width, amount, rng)
+    grounds = np.concatenate((np.arange(amount_colors), rng.integers(0, amount_colors, max(0, amount - amount_colors))))
+    rng.shuffle(grounds)
+    return {(index // width, index % width): ground for index, ground in zip(indexes, grounds.tolist())}
+
+
+def labels_dtype(amount_colors):
+    """
+    Function that chooses the smallest data type of array
+    with indexes of provided amount of colors
+
+    :param amount_colors: Amount of colors
+    :type amount_colors: int
+    """
+
+    return np.uint8 if amount_colors <= 256 else np.uint16
+
+
+def palette_image(labels, palette):
+    """
+    Function that makes image with palette from array with indexes
+    of colors. If there are too many colors for palette, RGB image is made
+
+    :param labels: NumPy array with indexes of colors
+    :type labels: numpy.ndarray
+    :param palette: NumPy array with RGB tuples of colors
+    :type palette: numpy.ndarray
+    """
+
+    if len(palette) > 256:
+        return Image.fromarray(palette[labels])
+    image = Image.fromarray(labels.astype(np.uint8, copy=False), 'P')
+    image.putpalette(palette.ravel().tolist())
+    return image
+
+
+def add_black(palette):
+    """
+    Function that finds black color in palette, adding it
+    at the end of palette if it is not there
 
-    :param limit1: First high limit
-    :type limit1: int
-    :param limit2: Second high limit
-    :type limit2: int
+    :param palette: NumPy array with RGB tuples of colors
+    :type palette: numpy.ndarray
+    :returns: Palette with black color and index of black color
+    :rtype: tuple
     """
 
-    modified_x = randint(0, limit1 - 1)
-    modified_y = randint(0, limit2 - 1)
-    return modified_x, modified_y
+    black = np.flatnonzero((palette == 0).all(axis=1))
+    if len(black):
+        return palette, black[0]
+    return np.vstack((palette, np.zeros((1, 3), dtype=palette.dtype))), len(palette)
 
 
-def add_to_set(used_set, item):
+def expand_array(array, scale):
     """
-    Function that adds provided item to set
+    Function that expands two dimensional array 'scale' times
+    along both axes by repeating every element
 
-    :param used_set: Provided set of items
-    :type used_set: set
-    :param item: Provided item
+    :param array: Provided array
+    :type array: numpy.ndarray
+    :param scale: Amount of repetitions of every element along every axis
+    :type scale: int
     """
 
-    used_set.add(item)
+    height, width = array.shape
+    repeated = np.broadcast_to(array[:, None, :, None], (height, scale, width, scale))
+    return repeated.reshape(height * scale, width * scale)
+
+
+def pack_rgb(rgb):
+    """
+    Function that packs RGB colors into single integers,
+    so colors can be compared and sorted as numbers
+
+    :param rgb: NumPy array with RGB values in the last axis
+    :type rgb: numpy.ndarray
+    :returns: Array of integers 0xRRGGBB
+    :rtype: numpy.ndarray
+    """
+
+    rgb = np.asarray(rgb, dtype=np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def packed_colors(image, table=None):
+    """
+    Function that converts small image or part of image to array of colors
+    packed by 'pack_rgb' function, so the whole image does not have to be packed
+
+    :param image: Image object
+    :type image: PIL.Image.Image
+    :param table: Packed colors of palette of image with palette
+    :type table: numpy.ndarray
+    :returns: Two dimensional array of packed colors
+    :rtype: numpy.ndarray
+    """
+
+    if table is not None:
+        return table[np.asarray(image)]
+    return pack_rgb(np.asarray(image.convert('RGB')))
+
+
+def read_row(image, index, table=None, start=0, step=1):
+    """
+    Function that reads every 'step' pixel of one row of image, starting
+    from 'start' pixel, as colors packed by 'pack_rgb' function. Pixels are
+    chosen before their colors are packed
+
+    :param image: Image object
+    :type image: PIL.Image.Image
+    :param index: Index of row
+    :type index: int
+    :param table: Packed colors of palette of image with palette
+    :type table: numpy.ndarray
+    :returns: One dimensional array of packed colors
+    :rtype: numpy.ndarray
+    """
+
+    row = image.crop((0, index, image.width, index + 1))
+    if table is not None:
+        return table[np.asarray(row)[0, start::step]]
+    return pack_rgb(np.asarray(row.convert('RGB'))[0, start::step])
+
+
+def detect_cell_size(image, table=None, lines=256):
+    """
+    Function that finds length of side of a square made from every point
+    of a Map in an image. Grid drawn by TileMap.img_with_grid is black
+    every 'size' rows and columns starting from the first one, black rows
+    are read one by one and black columns are checked in the middle row
+    of every row of squares. If there is no grid, size is the greatest
+    common divisor of lengths of runs of equal rows and columns found
+    in 'lines' evenly spread rows and columns
+
+    :param image: Image object
+    :type image: PIL.Image.Image
+    :param table: Packed colors of palette of image with palette
+    :type table: numpy.ndarray
+    :param lines: Amount of rows and columns compared to find runs,
+    all of them in smaller images
+    :type lines: int
+    :returns: Size of a square and if image has a grid
+    :rtype: tuple
+    """
+
+    width, height = image.size
+    black_rows = dict()
+
+    def is_black(index):
+        if index not in black_rows:
+            row = image.crop((0, index, width, index + 1)).convert('RGB')
+            black_rows[index] = row.getextrema() == ((0, 0), (0, 0), (0, 0))
+        return black_rows[index]
+
+    for size in range(2, min(height, width) + 1):
+        if not height % size and not width % size and all(is_black(x) for x in range(0, height, size)) \
+                and all(not read_row(image, x, table, 0, size).any() for x in range(size // 2, height, size)):
+            return size, True
+    # Nearest neighbour resizing picks whole rows or columns of image
+    by_cols = packed_colors(image.resize((min(width, lines), height), Image.NEAREST), table)
+    by_rows = packed_colors(image.resize((width, min(height, lines)), Image.NEAREST), table)
+    row_changes = np.flatnonzero((by_cols[1:] != by_cols[:-1]).any(axis=1)) + 1
+    col_changes = np.flatnonzero((by_rows[:, 1:] != by_rows[:, :-1]).any(axis=0)) + 1
+    return int(np.gcd.reduce(np.concatenate(([height, width], row_changes, col_changes)))), False
+
@@ -0,0 +1,99 @@
+from tilemap_help_functions import add_black
+import numpy as np
+import struct
+import zlib
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Compressed data is written in IDAT chunks of about this size
+IDAT_SIZE = 1 << 16
+
+
+def png_chunk(kind, data):
+    """
+    Function that makes PNG chunk with its length and checksum
+
+    :param kind: Type of chunk, like b'IHDR'
+    :type kind: bytes
+    :param data: Content of chunk
+    :type data: bytes
+    :rtype: bytes
+    """
+
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def expanded_rows(labels, palette, scale=16, grid=True):
+    """
+    Generator that makes rows of image of Tile Map one row of a Map
+    at a time, every point expanded to square 'scale' x 'scale' with black
+    top and left border if 'grid' is True. Every row starts with PNG
+    filter byte
+
+    :param labels: NumPy array with indexes of colors
+    :type labels: numpy.ndarray
+    :param palette: NumPy array with RGB tuples of colors
+    :type palette: numpy.ndarray
+    :returns: Bytes of 'scale' rows of image
+    :rtype: bytes
+    """
+
+    if grid:
+        palette, black = add_black(palette)
+    rgb = len(palette) > 256
+    for row in labels:
+        expanded = np.repeat(row.astype(np.uint16 if rgb else np.uint8), scale)
+        if grid:
+            expanded[::scale] = black
+        line = b'\x00' + (palette[expanded] if rgb else expanded).tobytes()
+        if grid:
+            border = b'\x00' + (palette[np.full_like(expanded, black)] if rgb else
+                                np.full_like(expanded, black)).tobytes()
+            yield border + line * (scale - 1)
+        else:
+            yield line * scale
+
+
+def write_png(path, labels, palette, scale=16, grid=True, level=6):
+    """
+    Function that saves image of Tile Map as PNG file without making
+    the whole image in memory. Rows of image are made and compressed
+    one row of a Map at a time, so memory depends only on width of image
+
+    :param path: Path of a file
+    :type path: str
+    :param labels: NumPy array with indexes of colors
+    :type labels: numpy.ndarray
+    :param palette: NumPy array with RGB tuples of colors
+    :type palette: numpy.ndarray
+    :param scale: Length of side of a square made from every point
+    :type scale: int
+    :param grid: If black grid is drawn between points
+    :type grid: bool
+    :param level: Level of zlib compression
+    :type level: int
+    """
+
+    height, width = labels.shape
+    full_palette = add_black(palette)[0] if grid else palette
+    rgb = len(full_palette) > 256
+    with open(path, 'wb') as handle:
+        handle.write(PNG_SIGNATURE)
+        # Bit depth 8, color type 2 (RGB) or 3 (palette), no interlace
+        handle.write(png_chunk(b'IHDR', struct.pack('>IIBBBBB', width * scale, height * scale, 8, 2 if rgb else 3, 0, 0, 0)))
+        if not rgb:
+            handle.write(png_chunk(b'PLTE', full_palette.astype(np.uint8).tobytes()))
+        compressor = zlib.compressobj(level)
+        pending = []
+        size = 0
+        for rows in expanded_rows(labels, palette, scale, grid):
+            data = compressor.compress(rows)
+            if data:
+                pending.append(data)
+                size += len(data)
+            if size >= IDAT_SIZE:
+                handle.write(png_chunk(b'IDAT', b''.join(pending)))
+                pending, size = [], 0
+        pending.append(compressor.flush())
+        handle.write(png_chunk(b'IDAT', b''.join(pending)))
+        handle.write(png_chunk(b'IEND', b''))
@@ -0,0 +1,132 @@
+from tilemap_help_functions import palette_image
+from math import ceil, log2
+import numpy as np
+import os
+
+
+def downsample_mode(labels):
+    """
+    Function that halves array with indexes of colors, every square
+    of 2x2 points becomes one point with the most frequent index.
+    If two indexes are equally frequent, the one met first in order
+    top left, top right, bottom left, bottom right is chosen.
+    Odd last row or column is repeated
+
+    :param labels: NumPy array with indexes of colors
+    :type labels: numpy.ndarray
+    :returns: Array with halved dimensions, rounded up
+    :rtype: numpy.ndarray
+    """
+
+    height, width = labels.shape
+    if height % 2 or width % 2:
+        labels = np.pad(labels, ((0, height % 2), (0, width % 2)), mode='edge')
+    corners = np.stack([labels[::2, ::2], labels[::2, 1::2], labels[1::2, ::2], labels[1::2, 1::2]])
+    # Every corner is counted together with corners equal to it
+    counts = (corners[:, None] == corners[None, :]).sum(axis=1)
+    chosen = np.argmax(counts, axis=0)
+    return np.take_along_axis(corners, chosen[None], axis=0)[0]
+
+
+def pyramid_levels(height, width, tile_size=256):
+    """
+    Function that counts levels of pyramid, so that the smallest
+    level fits in one tile
+
+    :rtype: int
+    """
+
+    return max(0, ceil(log2(max(height, width) / tile_size))) + 1
+
+
+class PyramidWriter:
+    """
+    A Class used to write levels of pyramid made from rows
+    of the most detailed level given one band after another
+
+    Every level keeps only rows that do not make a whole row of tiles yet,
+    a whole row of tiles is saved and halved rows are passed to the next
+    level, so all levels are never kept in memory at once.
+    """
+
+    def __init__(self, directory, palette, height, width, tile_size=256):
+        self.directory = directory
+        self.palette = palette
+        self.tile_size = tile_size
+        self.levels = pyramid_levels(height, width, tile_size)
+        self.buffers = [[] for _ in range(self.levels)]
+        self.buffered = [0] * self.levels
+        self.tile_rows = [0] * self.levels
+        self.tiles = 0
+
+    def push(self, level, rows):
+        """
+        Method that adds rows to level and saves every whole row of tiles
+        """
+
+        self.buffers[level].append(rows)
+        self.buffered[level] += len(rows)
+        if self.buffered[level] >= self.tile_size:
+            band = np.concatenate(self.buffers[level])
+            while len(band) >= self.tile_size:
+                self.write_band(level, band[:self.tile_size])
+                band = band[self.tile_size:]
+            self.buffers[level] = [band] if len(band) else []
+            self.buffered[level] = len(band)
+
+    def write_band(self, level, band):
+        """
+        Method that saves one row of tiles of level and passes
+        halved band to the next level
+        """
+
+        zoom = self.levels - 1 - level
+        for column, y_start in enumerate(range(0, band.shape[1], self.tile_size)):
+            folder = os.path.join(self.directory, str(zoom), str(column))
+            os.makedirs(folder, exist_ok=True)
+            tile = band[:, y_start:y_start + self.tile_size]
+            palette_image(np.ascontiguousarray(tile), self.palette).save(
+                os.path.join(folder, f'{self.tile_rows[level]}.png'))
+            self.tiles += 1
+        self.tile_rows[level] += 1
+        if level + 1 < self.levels:
+            self.push(level + 1, downsample_mode(band))
+
+    def close(self):
+        """
+        Method that saves rows left in every level, from the most detailed
+        """
+
+        for level in range(self.levels):
+            if self.buffered[level]:
+                band = np.concatenate(self.buffers[level])
+                self.buffers[level], self.buffered[level] = [], 0
+                self.write_band(level, band)
+
+
+def export_pyramid(labels, palette, directory, tile_size=256):
+    """
+    Function that writes pyramid of levels of Tile Map as PNG tiles
+    with palette, in files 'directory/z/x/y.png'. The most detailed level
+    has the highest zoom, every next level is halved by the most frequent
+    ground, so borders of grounds stay sharp. Labels are read one row
+    of tiles after another, so array mapped to file can be bigger than memory
+
+    :param labels: NumPy array with indexes of colors of grounds
+    :type labels: numpy.ndarray
+    :param palette: NumPy array with RGB tuples of colors
+    :type palette: numpy.ndarray
+    :param directory: Directory of tiles
+    :type directory: str
+    :param tile_size: Length of side of a tile, should be even
+    :type tile_size: int
+    :returns: Amount of levels and amount of saved tiles
+    :rtype: tuple
+    """
+
+    height, width = labels.shape
+    writer = PyramidWriter(directory, palette, height, width, tile_size)
+    for x_start in range(0, height, tile_size):
+        writer.push(0, np.asarray(labels[x_start:x_start + tile_size]))
+    writer.close()
+    return writer.levels, writer.tiles
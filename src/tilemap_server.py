@@ -0,0 +1,209 @@
+from tilemap import TileMap
+from tilemap_assignment import CentralPtsGrid, nearest_central_pts
+from tilemap_help_functions import labels_dtype, palette_image
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from math import ceil, log2
+import numpy as np
+import argparse
+import asyncio
+import io
+import re
+
+
+TILE_PATH = re.compile(r'^/(\d+)/(\d+)/(\d+)\.png$')
+TILE_BLOCK = 32
+
+
+class TileServer:
+    """
+    A Class used to serve Tile Map as PNG tiles over HTTP
+
+    Tiles are addressed as /z/x/y.png, where 'x' is a column and 'y' is
+    a row of tiles. At the highest zoom every pixel of a tile is one point
+    of a Map, at every lower zoom a pixel covers twice more points in both
+    directions. Indexes of colors of a tile are computed only for its
+    pixels, directly from central points of a Map, so the whole Map is
+    never made. Encoded tiles are kept in LRU cache.
+    """
+
+    def __init__(self, tmap, tile_size=256, cache_tiles=1024, workers=None):
+        """
+        Initiates an TileServer object
+
+        :param tmap: Tile Map to serve, only its central points are used
+        :type tmap: TileMap
+        :param tile_size: Length of side of a tile in pixels
+        :type tile_size: int
+        :param cache_tiles: Maximal amount of encoded tiles kept in memory
+        :type cache_tiles: int
+        :param workers: Amount of threads computing tiles
+        :type workers: int
+        """
+
+        self.width = tmap.width
+        self.height = tmap.height
+        self.salt = tmap.salt
+        self.palette = tmap.palette
+        colors = tmap.colors_to_use()
+        points = list(tmap.chosen_pts)
+        self.central_x = np.array([point[0] for point in points])
+        self.central_y = np.array([point[1] for point in points])
+        self.central_grounds = np.array([colors.index(tmap.chosen_pts[point]) for point in points],
+                                        dtype=labels_dtype(len(colors)))
+        self.grid = CentralPtsGrid(self.central_x, self.central_y, self.height, self.width)
+        self.tile_size = tile_size
+        self.max_zoom = max(0, ceil(log2(max(self.width, self.height) / tile_size)))
+        self.cache_tiles = cache_tiles
+        self.cache = OrderedDict()
+        self.pending = dict()
+        self.executor = ThreadPoolExecutor(workers)
+
+    def tile_labels(self, zoom, column, row):
+        """
+        Method that computes indexes of colors of pixels of a tile.
+        Tiles at the edge of a Map are cut to its size
+
+        :returns: NumPy array with indexes of colors
+        or None if tile is outside of a Map
+        :rtype: numpy.ndarray
+        """
+
+        if zoom > self.max_zoom:
+            return None
+        step = 2 ** (self.max_zoom - zoom)
+        # Pixels starting outside of a Map are cut, the rest is sampled
+        # in the middle of points it covers
+        rows = row * self.tile_size * step + np.arange(self.tile_size) * step
+        cols = column * self.tile_size * step + np.arange(self.tile_size) * step
+        rows = np.minimum(rows[rows < self.height] + step // 2, self.height - 1)
+        cols = np.minimum(cols[cols < self.width] + step // 2, self.width - 1)
+        if not len(rows) or not len(cols):
+            return None
+        labels = np.empty((len(rows), len(cols)), dtype=self.central_grounds.dtype)
+        # At low zoom a tile covers many central points, so candidates
+        # are found separately for small blocks of its pixels
+        for x_start in range(0, len(rows), TILE_BLOCK):
+            block_rows = rows[x_start:x_start + TILE_BLOCK]
+            for y_start in range(0, len(cols), TILE_BLOCK):
+                block_cols = cols[y_start:y_start + TILE_BLOCK]
+                candidates = self.grid.query(block_rows[0], block_rows[-1] + 1, block_cols[0], block_cols[-1] + 1)
+                pts_x, pts_y = np.meshgrid(block_rows, block_cols, indexing='ij')
+                nearest = nearest_central_pts(pts_x.ravel(), pts_y.ravel(), self.central_x[candidates],
+                                              self.central_y[candidates], self.width, self.salt)
+                labels[x_start:x_start + TILE_BLOCK, y_start:y_start + TILE_BLOCK] = \
+                    self.central_grounds[candidates[nearest]].reshape(len(block_rows), len(block_cols))
+        return labels
+
+    def tile_png(self, zoom, column, row):
+        """
+        Method that encodes tile as PNG image with palette
+
+        :returns: Content of PNG file or None if tile is outside of a Map
+        :rtype: bytes
+        """
+
+        labels = self.tile_labels(zoom, column, row)
+        if labels is None:
+            return None
+        content = io.BytesIO()
+        palette_image(labels, self.palette).save(content, format='PNG')
+        return content.getvalue()
+
+    async def get_tile(self, zoom, column, row):
+        """
+        Coroutine that gets tile from cache or computes it in thread pool.
+        Tile requested again before it is computed is computed only once
+
+        :rtype: bytes
+        """
+
+        key = (zoom, column, row)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if key not in self.pending:
+            loop = asyncio.get_running_loop()
+            self.pending[key] = loop.run_in_executor(self.executor, self.tile_png, zoom, column, row)
+        try:
+            content = await asyncio.shield(self.pending[key])
+        finally:
+            self.pending.pop(key, None)
+        self.cache[key] = content
+        while len(self.cache) > self.cache_tiles:
+            self.cache.popitem(last=False)
+        return content
+
+    async def handle(self, reader, writer):
+        """
+        Coroutine that answers HTTP requests of one connection
+        """
+
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+                headers = dict()
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip().lower()
+                parts = request.decode('latin-1').split()
+                match = TILE_PATH.match(parts[1]) if len(parts) == 3 and parts[0] == 'GET' else None
+                content = await self.get_tile(*map(int, match.groups())) if match else None
+                keep_alive = headers.get('connection') != 'close' and parts[-1:] == ['HTTP/1.1']
+                if content is None:
+                    status, content_type, content = '404 Not Found', 'text/plain', b'Not Found'
+                else:
+                    status, content_type = '200 OK', 'image/png'
+                writer.write((f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                              f'Content-Length: {len(content)}\r\n'
+                              f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n').encode() + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8000):
+        """
+        Coroutine that starts HTTP server
+
+        :returns: Started server
+        :rtype: asyncio.Server
+        """
+
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def serve(tmap, host, port, tile_size):
+    server = TileServer(tmap, tile_size)
+    started = await server.start(host, port)
+    print(f'Serving tiles /z/x/y.png with zoom 0-{server.max_zoom} on http://{host}:{port}')
+    async with started:
+        await started.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve Tile Map as PNG tiles')
+    parser.add_argument('width', type=int)
+    parser.add_argument('height', type=int)
+    parser.add_argument('--grounds', nargs='+', default=[])
+    parser.add_argument('--min-pts', type=int)
+    parser.add_argument('--max-pts', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--tile-size', type=int, default=256)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    tmap = TileMap(args.width, args.height, args.grounds, {}, args.min_pts, args.max_pts, seed=args.seed)
+    asyncio.run(serve(tmap, args.host, args.port, args.tile_size))
+
+
+if __name__ == "__main__":
+    main()
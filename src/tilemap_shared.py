@@ -0,0 +1,89 @@
+from tilemap_assignment import (
+    BANDS_PER_WORKER,
+    CentralPtsGrid,
+    assign_window,
+    choose_assignment,
+    )
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from math import ceil
+import numpy as np
+import os
+
+
+def fill_shard(job):
+    """
+    Function that finds the nearest central points of rows of a Map from
+    'x_start' to 'x_end' and writes their indexes in place into array
+    in shared memory, so only amount of broken ties is sent back from process
+
+    :param job: Dictionary with name and shape of shared array,
+    central points, salt, assignment and rows
+    :type job: dict
+    :returns: Amount of broken ties
+    :rtype: int
+    """
+
+    shared = SharedMemory(name=job['name'])
+    try:
+        regions = np.ndarray(job['shape'], dtype=np.int32, buffer=shared.buf)
+        height, width = job['shape']
+        x_start, x_end = job['x_start'], job['x_end']
+        central_x, central_y, salt = job['central_x'], job['central_y'], job['salt']
+        counts = dict()
+        if job['assignment'] == 'grid':
+            grid = CentralPtsGrid(central_x, central_y, height, width)
+            regions[x_start:x_end] = grid.assign_window(salt, x_start, x_end, 0, width, counts=counts)
+        else:
+            regions[x_start:x_end] = assign_window(central_x, central_y, width, salt, x_start, x_end, 0, width, counts)
+        del regions
+    finally:
+        shared.close()
+    return counts.get('ties', 0)
+
+
+def assign_shared(central_x, central_y, height, width, salt, assignment=None, processes=None, counts=None):
+    """
+    Function that finds the nearest central point of every point of a Map
+    in pool of processes. Central points are already chosen, so every
+    process gets them with a band of rows and fills these rows of array
+    in shared memory. Ties are broken by coordinates, so result is the same
+    as result of one process
+
+    :param assignment: 'brute', 'grid' or None to choose it
+    by amount of central points
+    :type assignment: str
+    :param processes: Amount of processes, by default amount of CPUs
+    :type processes: int
+    :param counts: Dictionary where amount of broken ties is added
+    to key 'ties', if provided
+    :type counts: dict
+    :returns: Two dimensional array with indexes of the nearest central points
+    :rtype: numpy.ndarray
+    """
+
+    if not assignment:
+        assignment = choose_assignment(len(central_x))
+    processes = processes or os.cpu_count() or 1
+    shared = SharedMemory(create=True, size=max(1, height * width * np.dtype(np.int32).itemsize))
+    try:
+        band = max(1, ceil(height / (BANDS_PER_WORKER * processes)))
+        jobs = [{
+            'name': shared.name,
+            'shape': (height, width),
+            'central_x': central_x,
+            'central_y': central_y,
+            'salt': salt,
+            'assignment': assignment,
+            'x_start': x_start,
+            'x_end': min(x_start + band, height),
+        } for x_start in range(0, height, band)]
+        with ProcessPoolExecutor(processes) as executor:
+            ties = sum(executor.map(fill_shard, jobs))
+        regions = np.ndarray((height, width), dtype=np.int32, buffer=shared.buf).copy()
+    finally:
+        shared.close()
+        shared.unlink()
+    if counts is not None:
+        counts['ties'] = counts.get('ties', 0) + ties
+    return regions
@@ -0,0 +1,197 @@
+from tilemap import TileMap
+from tilemap_exceptions import InvalidData
+from tilemap_assignment import CentralPtsGrid, assign_map, assign_window, choose_assignment
+from tilemap_help_functions import labels_dtype, palette_image
+import numpy as np
+import json
+
+
+class MapSpec:
+    """
+    A Class used to describe Tile Map independently of its size
+
+    Central points are kept as fractions of height and width of a Map,
+    measured to middles of points, so the same description can be made
+    into a Map of any size. In a Map of given size every central point
+    is put into the point containing it, so description of Tile Map made
+    in its own size gives exactly the same Map.
+    """
+
+    def __init__(self, central_pts, palette, names=None, seed=None, salt=0):
+        """
+        Initiates an MapSpec object
+
+        :param central_pts: List of tuples (u, v, ground), where 'u' is
+        fraction of height, 'v' is fraction of width, both in range [0, 1],
+        and 'ground' is index of color in palette
+        :type central_pts: list
+        :param palette: List of RGB tuples of grounds' colors
+        :type palette: list
+        :param names: Names of grounds, one for every color
+        :type names: list
+        :param seed: Seed of generator of random numbers used to make
+        central points, if it is known
+        :type seed: int
+        :param salt: Number that changes the outcome of tie-breaking
+        :type salt: int
+        """
+
+        if not central_pts:
+            raise InvalidData(f"Map needs at least one central point")
+        self.central_u = np.array([point[0] for point in central_pts], dtype=np.float64)
+        self.central_v = np.array([point[1] for point in central_pts], dtype=np.float64)
+        self.central_grounds = np.array([point[2] for point in central_pts], dtype=np.int64)
+        if ((self.central_u < 0) | (self.central_u > 1) | (self.central_v < 0) | (self.central_v > 1)).any():
+            raise InvalidData(f"Coordinates of central points should be in range [0, 1]")
+        self.palette = np.array(palette, dtype=np.uint8).reshape(-1, 3)
+        if ((self.central_grounds < 0) | (self.central_grounds >= len(self.palette))).any():
+            raise InvalidData(f"Ground of central point is not in palette")
+        self.names = list(names) if names else None
+        self.seed = seed
+        self.salt = salt
+
+    @classmethod
+    def from_tilemap(cls, tmap):
+        """
+        Classmethod that describes central points of constructed Tile Map
+
+        :type tmap: TileMap
+        :rtype: MapSpec
+        """
+
+        colors = tmap.colors_to_use()
+        central_pts = [((x + 0.5) / tmap.height, (y + 0.5) / tmap.width, colors.index(ground))
+                       for (x, y), ground in tmap.chosen_pts.items()]
+        names = list(tmap.grounds) + list(tmap.own_grounds)
+        return cls(central_pts, colors, names, tmap.seed, tmap.salt)
+
+    @classmethod
+    def random(cls, amount, grounds=None, own_grounds=None, seed=None):
+        """
+        Classmethod that chooses central points at random positions,
+        every ground is used at least one time
+
+        :param amount: Amount of central points
+        :type amount: int
+        :param grounds: List of basic grounds given in TileMap class
+        (default grounds are 'water' and 'land')
+        :type grounds: list
+        :param own_grounds: Dictionary of grounds that can be provided by User
+        :type own_grounds: dict
+        :rtype: MapSpec
+        """
+
+        grounds = ['water', 'land'] if not grounds and not own_grounds else list(grounds or [])
+        own_grounds = dict(own_grounds or {})
+        palette = [TileMap.rgb_of_grounds[ground] for ground in grounds] + list(own_grounds.values())
+        if type(amount) != int or amount < len(palette):
+            raise InvalidData(f"Amount of central points cannot be less than amount of grounds")
+        rng = np.random.default_rng(seed)
+        salt = int(rng.integers(2**32))
+        coordinates = rng.random((amount, 2))
+        central_grounds = np.concatenate((rng.permutation(len(palette)),
+                                          rng.integers(len(palette), size=amount - len(palette))))
+        central_pts = [(u, v, ground) for (u, v), ground in zip(coordinates.tolist(), central_grounds.tolist())]
+        return cls(central_pts, palette, grounds + list(own_grounds), seed, salt)
+
+    def central_pts_in(self, width, height):
+        """
+        Method that puts central points into points of a Map of given size.
+        If a few central points are in one point, only the first is kept
+
+        :returns: Arrays of rows, columns and grounds of central points
+        :rtype: tuple
+        """
+
+        central_x = np.minimum((self.central_u * height).astype(np.int64), height - 1)
+        central_y = np.minimum((self.central_v * width).astype(np.int64), width - 1)
+        _, first = np.unique(central_x * width + central_y, return_index=True)
+        first.sort()
+        return central_x[first], central_y[first], self.central_grounds[first]
+
+    def rasterize(self, width, height, window=None, workers=None):
+        """
+        Method that makes Map of given size or its rectangular part,
+        part of a Map is the same as the same part of the whole Map
+
+        :param width: Width of a Map
+        :type width: int
+        :param height: Height of a Map
+        :type height: int
+        :param window: Tuple (x_start, x_end, y_start, y_end) with rows
+        and columns of part of a Map, by default the whole Map
+        :type window: tuple
+        :param workers: Amount of threads
+        :type workers: int
+        :returns: Array with index of color of every point
+        :rtype: numpy.ndarray
+        """
+
+        if type(width) != int or type(height) != int or width < 1 or height < 1:
+            raise InvalidData(f"Wrong dimensions")
+        central_x, central_y, central_grounds = self.central_pts_in(width, height)
+        grounds = central_grounds.astype(labels_dtype(len(self.palette)))
+        if window is None:
+            return grounds[assign_map(central_x, central_y, height, width, self.salt, workers=workers)]
+        x_start, x_end, y_start, y_end = window
+        if not (0 <= x_start < x_end <= height and 0 <= y_start < y_end <= width):
+            raise InvalidData(f"Window is outside of a Map")
+        if choose_assignment(len(central_x)) == 'grid':
+            grid = CentralPtsGrid(central_x, central_y, height, width)
+            return grounds[grid.assign_window(self.salt, x_start, x_end, y_start, y_end)]
+        return grounds[assign_window(central_x, central_y, width, self.salt, x_start, x_end, y_start, y_end)]
+
+    def image(self, width, height, window=None):
+        """
+        Method that makes image with palette of Map of given size or its part
+
+        :rtype: PIL.Image.Image
+        """
+
+        return palette_image(self.rasterize(width, height, window), self.palette)
+
+    def to_dict(self):
+        """
+        Method that describes Map with types that can be saved as JSON
+
+        :rtype: dict
+        """
+
+        return {
+            'central_pts': [[u, v, ground] for u, v, ground in zip(
+                self.central_u.tolist(), self.central_v.tolist(), self.central_grounds.tolist())],
+            'palette': self.palette.tolist(),
+            'names': self.names,
+            'seed': self.seed,
+            'salt': self.salt,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Classmethod that makes description of Map from dictionary
+        made by 'to_dict' method
+
+        :rtype: MapSpec
+        """
+
+        return cls(data['central_pts'], data['palette'], data.get('names'), data.get('seed'), data.get('salt', 0))
+
+    def to_json(self):
+        """
+        Method that saves description of Map as JSON text
+
+        :rtype: str
+        """
+
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text):
+        """
+        Classmethod that reads description of Map from JSON text
+
+        :rtype: MapSpec
+        """
+
+        return cls.from_dict(json.loads(text))
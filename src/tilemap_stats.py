@@ -0,0 +1,81 @@
+from time import perf_counter
+import tracemalloc
+
+
+class TileMapStats:
+    """
+    A Class used to collect measurements of stages of Tile Map
+
+    Object is called with dictionary describing every finished stage:
+    name of 'stage', wall time in 'seconds', the highest amount of memory
+    allocated during stage in 'peak_bytes' and amounts of items, such as
+    'pixels', 'central_pts' or 'ties'. Any other function accepting
+    such dictionary can be used instead of it.
+    """
+
+    def __init__(self):
+        """
+        Initiates an TileMapStats object
+
+        :param records: Dictionaries describing finished stages
+        :type records: list
+        """
+
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def seconds(self):
+        """
+        Method that sums wall time of every stage
+
+        :returns: Dictionary of seconds spent in every stage
+        :rtype: dict
+        """
+
+        seconds = dict()
+        for record in self.records:
+            seconds[record['stage']] = seconds.get(record['stage'], 0) + record['seconds']
+        return seconds
+
+
+class StageMeasurement:
+    """
+    A Class used to measure one stage of Tile Map with 'with' statement
+    """
+
+    def __init__(self, callback, stage, counts):
+        """
+        Initiates an StageMeasurement object
+
+        :param callback: Function called with dictionary describing stage
+        :type callback: function
+        :param stage: Name of stage
+        :type stage: str
+        :param counts: Amounts of items processed in stage, can be
+        changed until stage is finished
+        :type counts: dict
+        """
+
+        self.callback = callback
+        self.stage = stage
+        self.counts = counts
+
+    def __enter__(self):
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = perf_counter()
+        return self.counts
+
+    def __exit__(self, *exc_info):
+        seconds = perf_counter() - self.start
+        peak = tracemalloc.get_traced_memory()[1] - self.memory
+        if self.started_tracing:
+            tracemalloc.stop()
+        if exc_info[0] is None:
+            self.callback(dict({'stage': self.stage, 'seconds': seconds, 'peak_bytes': peak}, **self.counts))
+        return False